@@ -1,10 +1,13 @@
 import os
 import json
+import functools
+from typing import NamedTuple
 import dash
 from dash import html, dcc, Output, Input
 import dash_bootstrap_components as dbc
 import pandas as pd
 import plotly.express as px
+from dashboard.utils import read_parquet, list_simulations, count_rows, count_alive_species, load_latest_snapshot, COUNTS_COLUMNS
 
 # Load configuration from config.json for base folder and update frequency
 config_file = "config.json"
@@ -25,8 +28,7 @@ simulations_base_folder = os.path.join(folder_path, "Dibite_Simulation_Data")
 if os.path.exists(simulations_base_folder):
     sim_options = [
         {'label': sim, 'value': sim}
-        for sim in os.listdir(simulations_base_folder)
-        if os.path.isdir(os.path.join(simulations_base_folder, sim))
+        for sim in list_simulations(simulations_base_folder)
     ]
 else:
     sim_options = []
@@ -104,29 +106,120 @@ def update_text_data(sim_selected, n_intervals):
     sim_folder = os.path.join(simulations_base_folder, sim_selected)
     species_file = os.path.join(sim_folder, "species_data.parquet")
     counts_file = os.path.join(sim_folder, "species_counts.parquet")
+
+    # The file monitor keeps both metrics in a small snapshot file
+    snapshot = load_latest_snapshot(sim_folder)
+    if snapshot and "alive_species" in snapshot:
+        return f"Total Species Seen: {snapshot['total_species']}", f"Alive Species: {snapshot['alive_species']}"
     
     try:
-        species_df = pd.read_parquet(species_file)
-        total_species = species_df.shape[0]
+        # Only the parquet footer is read
+        total_species = count_rows(species_file)
     except Exception as e:
         print(f"Error loading species data: {e}")
         total_species = 0
 
     try:
-        counts_df = pd.read_parquet(counts_file)
-        if counts_df.empty:
-            alive_species = 0
-        else:
-            # Using the raw simulatedTime values as stored
-            max_update = counts_df['update_time'].max()
-            latest = counts_df[counts_df['update_time'] == max_update]
-            alive_species = (latest['count'] > 0).sum()
+        # Only the partition of the latest simulatedTime is read, and only when the counts changed
+        alive_species = count_alive_species(counts_file)
     except Exception as e:
         print(f"Error loading species counts: {e}")
         alive_species = 0
 
     return f"Total Species Seen: {total_species}", f"Alive Species: {alive_species}"
 
+# Aggregates behind the tab charts; only the figures built from them are cached
+class SimAggregates(NamedTuple):
+    alive: pd.DataFrame    # unique species alive per update_time
+    total: pd.DataFrame    # total bibites alive per update_time
+    bibites: pd.DataFrame  # counts of the species alive at the latest update, sorted by update_time
+
+def _sim_aggregates(counts_file):
+    counts_df = read_parquet(counts_file, columns=COUNTS_COLUMNS)
+    if counts_df.empty:
+        empty = pd.DataFrame()
+        return SimAggregates(empty, empty, empty)
+
+    df_alive = counts_df[counts_df['count'] > 0]\
+                .groupby('update_time')['speciesID']\
+                .nunique()\
+                .reset_index(name='alive_species')\
+                .sort_values('update_time')
+    df_total = counts_df.groupby("update_time")["count"]\
+                .sum()\
+                .reset_index(name="total_bibites")\
+                .sort_values("update_time")
+    # Species that are alive (count > 0) at the latest update
+    latest_update = counts_df['update_time'].max()
+    latest_data = counts_df[counts_df['update_time'] == latest_update]
+    species_alive_ids = latest_data[latest_data['count'] > 0]['speciesID'].unique()
+    df_bibites = counts_df[counts_df['speciesID'].isin(species_alive_ids)].sort_values("update_time")
+    return SimAggregates(df_alive, df_total, df_bibites)
+
+# Figures of the tabs as plain dicts, built once per version of the counts file
+# so every client and interval tick showing the same data shares one render
+class SimFigures(NamedTuple):
+    alive: dict
+    total: dict
+    bibites: dict  # None when no species is alive at the latest update
+
+@functools.lru_cache(maxsize=8)
+def _sim_figures(counts_file, mtime_ns):
+    try:
+        aggregates = _sim_aggregates(counts_file)
+    except Exception as e:
+        print(f"Error loading counts data: {e}")
+        empty = pd.DataFrame()
+        aggregates = SimAggregates(empty, empty, empty)
+
+    try:
+        fig_alive = px.line(
+            aggregates.alive,
+            x='update_time',
+            y='alive_species',
+            title="Alive Species Over Simulated Time",
+            markers=True,
+            labels={'update_time': 'Simulated Time', 'alive_species': 'Alive Species'}
+        ).to_dict()
+    except Exception as e:
+        print(f"Error creating alive species chart: {e}")
+        fig_alive = {}
+
+    try:
+        fig_total = px.line(
+            aggregates.total,
+            x="update_time",
+            y="total_bibites",
+            title="Total Bibites Alive Over Simulated Time",
+            markers=True,
+            labels={"update_time": "Simulated Time", "total_bibites": "Total Bibites Alive"}
+        ).to_dict()
+    except Exception as e:
+        print(f"Error creating total bibites chart: {e}")
+        fig_total = {}
+
+    # Line graph with a separate line for each species that are alive in the last update
+    try:
+        if aggregates.bibites.empty:
+            fig_bibites = None
+        else:
+            fig_bibites = px.line(
+                aggregates.bibites,
+                x="update_time",
+                y="count",
+                color="speciesID",
+                title="Bibites Alive Over Simulated Time by Species (Alive at Latest Update)",
+                markers=True,
+                labels={"update_time": "Simulated Time", "count": "Bibites Alive", "speciesID": "Species ID"}
+            ).to_dict()
+    except Exception as e:
+        print(f"Error creating bibites line chart: {e}")
+        fig_bibites = {}
+    return SimFigures(fig_alive, fig_total, fig_bibites)
+
+def get_sim_figures(counts_file):
+    return _sim_figures(counts_file, os.stat(counts_file).st_mtime_ns)
+
 # Callback to update the tab content (charts)
 @app.callback(
     Output("tab-content", "children"),
@@ -142,88 +235,30 @@ def render_tab_content(selected_tab, sim_selected, n_intervals):
     counts_file = os.path.join(sim_folder, "species_counts.parquet")
     
     try:
-        counts_df = pd.read_parquet(counts_file)
+        figures = get_sim_figures(counts_file)
     except Exception as e:
         print(f"Error loading counts data: {e}")
-        counts_df = pd.DataFrame()
+        figures = SimFigures({}, {}, None)
     
     if selected_tab == "sim":
         # "Sim" tab content: overall simulation details (as before)
-        try:
-            df_alive = counts_df[counts_df['count'] > 0]\
-                        .groupby('update_time')['speciesID']\
-                        .nunique()\
-                        .reset_index(name='alive_species')\
-                        .sort_values('update_time')
-            fig_alive = px.line(
-                df_alive,
-                x='update_time',
-                y='alive_species',
-                title="Alive Species Over Simulated Time",
-                markers=True,
-                labels={'update_time': 'Simulated Time', 'alive_species': 'Alive Species'}
-            )
-        except Exception as e:
-            print(f"Error creating alive species chart: {e}")
-            fig_alive = {}
-        
-        try:
-            df_total = counts_df.groupby("update_time")["count"]\
-                        .sum()\
-                        .reset_index(name="total_bibites")\
-                        .sort_values("update_time")
-            fig_total = px.line(
-                df_total,
-                x="update_time",
-                y="total_bibites",
-                title="Total Bibites Alive Over Simulated Time",
-                markers=True,
-                labels={"update_time": "Simulated Time", "total_bibites": "Total Bibites Alive"}
-            )
-        except Exception as e:
-            print(f"Error creating total bibites chart: {e}")
-            fig_total = {}
-        
         charts = dbc.Row([
-            dbc.Col(dcc.Graph(figure=fig_alive), width=6),
-            dbc.Col(dcc.Graph(figure=fig_total), width=6)
+            dbc.Col(dcc.Graph(figure=figures.alive), width=6),
+            dbc.Col(dcc.Graph(figure=figures.total), width=6)
         ])
         return charts
     
     elif selected_tab == "bibites":
         # "Bibites" tab: Line graph with a separate line for each species that are alive in the last update
-        try:
-            # Ensure there is data
-            if counts_df.empty:
-                return html.Div("No bibites data available.")
-            # Determine the latest update time
-            latest_update = counts_df['update_time'].max()
-            latest_data = counts_df[counts_df['update_time'] == latest_update]
-            # Get the speciesIDs that are alive (count > 0) at the latest update
-            species_alive_ids = latest_data[latest_data['count'] > 0]['speciesID'].unique()
-            # Filter counts_df to include only these species
-            df_line = counts_df[counts_df['speciesID'].isin(species_alive_ids)].sort_values("update_time")
-            
-            fig_bibites = px.line(
-                df_line,
-                x="update_time",
-                y="count",
-                color="speciesID",
-                title="Bibites Alive Over Simulated Time by Species (Alive at Latest Update)",
-                markers=True,
-                labels={"update_time": "Simulated Time", "count": "Bibites Alive", "speciesID": "Species ID"}
-            )
-        except Exception as e:
-            print(f"Error creating bibites line chart: {e}")
-            fig_bibites = {}
+        if figures.bibites is None:
+            return html.Div("No bibites data available.")
         return html.Div([
             html.H3("Bibites Analysis", style={'textAlign': 'center'}),
-            dcc.Graph(figure=fig_bibites)
+            dcc.Graph(figure=figures.bibites)
         ])
     else:
         return html.Div("Unknown tab selected.")
 
 
-
 if __name__ == '__main__':
-    app.run_server(debug=True, port=8050)
+    app.run(debug=True, port=8050)
@@ -1,29 +1,23 @@
-import subprocess
-import time
 import sys
+import threading
+
+import Save_File_Monitor
 
 def main():
     try:
-        # Start the file monitoring process
-        file_monitor_proc = subprocess.Popen(["python", "Save_File_Monitor.py"])
-        print("File monitor process started (Save_File_Monitor.py).")
-        
-        # Start the dashboard process from the dashboard folder
-        dashboard_proc = subprocess.Popen(["python", "dashboard/app.py"])
-        print("Dashboard process started (dashboard/app.py).")
-        
-        print("Both processes are running. Press Ctrl+C to exit.")
-        
-        # Keep the main process running to keep child processes alive
-        while True:
-            time.sleep(1)
+        # Run the file monitor as a daemon thread of the dashboard process; both import
+        # dashboard.utils, so pandas, pyarrow, the config and the caches are only loaded once
+        file_monitor_thread = threading.Thread(target=Save_File_Monitor.main, name="file-monitor", daemon=True)
+        file_monitor_thread.start()
+        print("File monitor started (Save_File_Monitor.py).")
+
+        from dashboard.app import app
+        print("Dashboard started (dashboard/app.py). Press Ctrl+C to exit.")
+
+        # The reloader would restart this process and start a second file monitor
+        app.run(debug=True, port=8050, use_reloader=False)
     except KeyboardInterrupt:
-        print("Shutting down processes...")
-        file_monitor_proc.terminate()
-        dashboard_proc.terminate()
-        file_monitor_proc.wait()
-        dashboard_proc.wait()
-        print("Processes terminated.")
+        print("Shutting down...")
     except Exception as e:
         print(f"An error occurred: {e}")
         sys.exit(1)
@@ -1,18 +1,113 @@
+import io
 import os
+import queue
+import threading
 import time
 import zipfile
-import json
-import re
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+import numpy as np
+import ijson
 import pandas as pd
 from datetime import datetime
-from dashboard.utils import get_simulations_base_folder, get_update_frequency, load_dataframe, save_dataframe, load_processed_log, update_processed_log, get_base_folder
+from watchdog.observers import Observer
+from watchdog.events import FileSystemEventHandler
+from dashboard.utils import parse_json, get_simulations_base_folder, load_dataframe, save_dataframe, save_counts, update_latest_snapshot, load_processed_log, update_processed_log, get_base_folder, COUNTS_COLUMNS
 
 folder_path = get_base_folder()
-poll_interval = get_update_frequency()
 simulations_base_folder = os.path.join(folder_path, "Dibite_Simulation_Data")
 os.makedirs(folder_path, exist_ok=True)
 processed_log_file = os.path.join(simulations_base_folder, "processed_zips.txt")
 
+# Threads reading the .bb8 files of one ZIP
+BB8_READER_THREADS = 4
+# A ZIP that fails to process (usually a save still being written) is queued again after
+# RETRY_DELAY seconds, at most MAX_RETRIES times; it is retried again on the next start
+RETRY_DELAY = 10
+MAX_RETRIES = 3
+
+# Every byte outside printable ASCII; the game's save files carry binary bytes around the JSON
+_NON_PRINTABLE = bytes(b for b in range(256) if not 0x20 <= b <= 0x7E)
+
+def load_json_bytes(file_bytes):
+    """Parse a save file's JSON after stripping all non-printable bytes."""
+    return parse_json(file_bytes.translate(None, _NON_PRINTABLE))
+
+def extract_species_id(file_bytes):
+    """
+    Return genes.speciesID from a .bb8 file, or None if it is missing.
+    The file is parsed as a stream that stops at the speciesID, so the rest of
+    the bibite (brain, body, ...) is never built into Python objects.
+    """
+    stream = io.BytesIO(file_bytes.translate(None, _NON_PRINTABLE))
+    for prefix, event, value in ijson.parse(stream, use_float=True):
+        if prefix == "genes.speciesID":
+            return value
+    return None
+
+def read_species_ids(zip_path, bb8_infos):
+    """
+    Return the speciesID of every .bb8 entry in bb8_infos.
+    The entries are split into contiguous slices that are read by separate threads,
+    each with its own handle on the ZIP since a ZipFile must not be read from several
+    threads at once. zlib releases the GIL while decompressing, so the threads overlap.
+    """
+    def read_slice(infos):
+        species_ids = []
+        with zipfile.ZipFile(zip_path, 'r') as z:
+            for bb8 in infos:
+                try:
+                    with z.open(bb8) as f:
+                        species_id = extract_species_id(f.read())
+                        if species_id is not None:
+                            species_ids.append(species_id)
+                        else:
+                            print(f"'speciesID' not found in {bb8.filename}.")
+                except Exception as e:
+                    print(f"Error processing file {bb8.filename}: {e}")
+        return species_ids
+
+    slice_size = max(1, -(-len(bb8_infos) // BB8_READER_THREADS))
+    slices = [bb8_infos[i:i + slice_size] for i in range(0, len(bb8_infos), slice_size)]
+    with ThreadPoolExecutor(max_workers=BB8_READER_THREADS) as pool:
+        return [species_id for ids in pool.map(read_slice, slices) for species_id in ids]
+
+def summarize_pellets(pellets):
+    """
+    Summarize the pellets of each zone into one row per zone with the plant and
+    meat pellet counts, total amounts and average scales. Any material other than
+    "Meat" is counted as plant.
+    """
+    zone_names = [zone["zone"] for zone in pellets]
+    n_zones = len(zone_names)
+
+    # Flatten every pellet into parallel arrays, tagged with its zone's position
+    zone_idx = np.fromiter((i for i, zone in enumerate(pellets) for _ in zone["pellets"]), dtype=np.intp)
+    is_meat = np.fromiter((p["pellet"]["material"] == "Meat" for zone in pellets for p in zone["pellets"]),
+                          dtype=bool, count=zone_idx.size)
+    amount = np.fromiter((float(p["pellet"]["amount"]) for zone in pellets for p in zone["pellets"]),
+                         dtype=np.float64, count=zone_idx.size)
+    scale = np.fromiter((float(p["transform"]["scale"]) for zone in pellets for p in zone["pellets"]),
+                        dtype=np.float64, count=zone_idx.size)
+
+    # One bin per (zone, material): even bins hold plant pellets, odd bins meat pellets
+    bins = 2 * zone_idx + is_meat
+    count = np.bincount(bins, minlength=2 * n_zones).reshape(n_zones, 2)
+    # astype keeps the sums float when there are no pellets at all (bincount then returns ints)
+    total_amount = np.bincount(bins, weights=amount, minlength=2 * n_zones).astype(np.float64).reshape(n_zones, 2)
+    scale_sum = np.bincount(bins, weights=scale, minlength=2 * n_zones).astype(np.float64).reshape(n_zones, 2)
+    avg_scale = np.divide(scale_sum, count, out=np.zeros_like(scale_sum), where=count > 0)
+
+    return pd.DataFrame({
+        "zone_name": zone_names,
+        "plant_pellet_count": count[:, 0],
+        "plant_total_amount": total_amount[:, 0],
+        "plant_avg_scale": avg_scale[:, 0],
+        "meat_pellet_count": count[:, 1],
+        "meat_total_amount": total_amount[:, 1],
+        "meat_avg_scale": avg_scale[:, 1],
+    })
+
 def process_zip(zip_path):
     print(f"Processing {zip_path}...")
     try:
@@ -20,10 +115,7 @@ def process_zip(zip_path):
             # --- Extract simulation name from settings.bb8settings ---
             try:
                 with z.open("settings.bb8settings") as f:
-                    file_bytes = f.read()
-                    input_str = file_bytes.decode('utf-8', errors='ignore')
-                    cleaned_str = re.sub(r'[^\x20-\x7E]', '', input_str)
-                    settings_data = json.loads(cleaned_str)
+                    settings_data = load_json_bytes(f.read())
                 zones = settings_data.get("zones", [])
                 zone_groups = settings_data.get("zoneGroups", [])
                 if zones and isinstance(zones, list):
@@ -35,31 +127,13 @@ def process_zip(zip_path):
                 print(f"Error processing settings.bb8settings: {e}")
                 sim_name = "default_sim"
 
-            # Determine simulation folder and file paths
-            sim_folder = os.path.join(simulations_base_folder, sim_name)
-            species_data_file = os.path.join(sim_folder, "species_data.parquet")
-            species_counts_file = os.path.join(sim_folder, "species_counts.parquet")
-            pellet_data_file = os.path.join(sim_folder, "pellet_data.parquet")
-            
-            # --- Load existing data for this simulation ---
-            species_df = load_dataframe(species_data_file)
-            counts_df = load_dataframe(species_counts_file, columns=["update_time", "speciesID", "count"])
-            pellet_df = load_dataframe(pellet_data_file)
-            
             # --- Process speciesData.json for species details ---
+            new_species = []
             try:
                 with z.open("speciesData.json") as f:
-                    data = json.load(f)
+                    data = parse_json(f.read())
                 new_species = data.get("recordedSpecies", [])
-                if new_species:
-                    new_species_df = pd.DataFrame(new_species)
-                    if not species_df.empty:
-                        species_df = pd.concat([species_df, new_species_df])
-                    else:
-                        species_df = new_species_df
-                    species_df = species_df.drop_duplicates(subset=["speciesID"]).reset_index(drop=True)
-                    #print(f"Species details updated: {len(species_df)} records total.")
-                else:
+                if not new_species:
                     print("No recordedSpecies data found in speciesData.json.")
             except Exception as e:
                 print(f"Error processing speciesData.json: {e}")
@@ -67,10 +141,7 @@ def process_zip(zip_path):
             # --- Process scene.bb8scene for simulatedTime ---
             try:
                 with z.open("scene.bb8scene") as f:
-                    file_bytes = f.read()
-                    input_str = file_bytes.decode('utf-8', errors='ignore')
-                    cleaned_str = re.sub(r'[^\x20-\x7E]', '', input_str)
-                    scene_data = json.loads(cleaned_str)
+                    scene_data = load_json_bytes(f.read())
                 simulated_time = scene_data.get("simulatedTime")
                 if simulated_time is None:
                     raise ValueError("simulatedTime not found")
@@ -81,124 +152,202 @@ def process_zip(zip_path):
                 update_time = "Unknown"
 
             # --- Process bibites folder for species counts ---
-            bb8_files = [f for f in z.namelist() if f.lower().startswith("bibites/") and f.lower().endswith(".bb8")]
-            species_ids = []
-            for bb8 in bb8_files:
-                try:
-                    with z.open(bb8) as f:
-                        file_bytes = f.read()
-                        input_str = file_bytes.decode('utf-8', errors='ignore')
-                        cleaned_str = re.sub(r'[^\x20-\x7E]', '', input_str)
-                        bb8_data = json.loads(cleaned_str)
-                        species_id = bb8_data.get("genes", {}).get("speciesID")
-                        if species_id is not None:
-                            species_ids.append(species_id)
-                        else:
-                            print(f"'speciesID' not found in {bb8}.")
-                except Exception as e:
-                    print(f"Error processing file {bb8}: {e}")
+            # Entries are read in the order they are stored, so the archive is read front to back
+            bb8_infos = sorted(
+                (info for info in z.infolist()
+                 if info.filename.lower().startswith("bibites/") and info.filename.lower().endswith(".bb8")),
+                key=lambda info: info.header_offset
+            )
+            species_ids = read_species_ids(zip_path, bb8_infos)
             
+            new_counts = pd.DataFrame(columns=["update_time", "speciesID", "count"])
             if species_ids:
-                count_series = pd.Series(species_ids).value_counts()
+                ids, counts = np.unique(np.asarray(species_ids, dtype=np.int64), return_counts=True)
                 new_counts = pd.DataFrame({
-                    "update_time": [update_time] * len(count_series),
-                    "speciesID": count_series.index,
-                    "count": count_series.values
+                    "update_time": np.full(ids.size, update_time),
+                    "speciesID": ids,
+                    "count": counts
                 })
-                counts_df = pd.concat([counts_df, new_counts], ignore_index=True)
                 #print(f"Species counts for simulated time {update_time} processed: {new_counts.shape[0]} species.")
             else:
                 print("No .bb8 files found or no speciesIDs extracted in bibites folder.")
 
             try:
                 with z.open("pellets.bb8scene") as f:
-                    file_bytes = f.read()
-                    input_str = file_bytes.decode('utf-8', errors='ignore')
-                    cleaned_str = re.sub(r'[^\x20-\x7E]', '', input_str)
-                    pellet_data = json.loads(cleaned_str)
+                    pellet_data = load_json_bytes(f.read())
                     pellets = pellet_data.get("pellets", [])       
 
-                zone_names = []
-                plant_counts = []
-                plant_amounts = []
-                plant_avg_scales = []
-                meat_counts = []
-                meat_amounts = []
-                meat_avg_scales = []
-                for zone in pellets:
-                    meat_count = 0
-                    meat_amount = 0
-                    plant_count = 0
-                    plant_amount = 0
-                    plant_scale = 0
-                    meat_scale = 0
-                    for pellet in zone["pellets"]:
-                        if pellet["pellet"]["material"] == "Meat":
-                            meat_count += 1
-                            meat_amount += float(pellet["pellet"]["amount"])
-                            meat_scale += float(pellet["transform"]["scale"])
-                        else:
-                            plant_count += 1
-                            plant_amount += float(pellet["pellet"]["amount"])
-                            plant_scale += float(pellet["transform"]["scale"])
-
-                    zone_names.append(zone["zone"])
-                    plant_counts.append(plant_count)
-                    plant_amounts.append(plant_amount)
-                    plant_avg_scales.append(plant_scale/plant_count if plant_count > 0 else 0)
-                    meat_counts.append(meat_count)
-                    meat_amounts.append(meat_amount)
-                    meat_avg_scales.append(meat_scale/meat_count if meat_count > 0 else 0)
-
-                new_zones = pd.DataFrame({
-                    "update_time": [update_time] * len(zone_names),
-                    "zone_name": zone_names,
-                    "plant_pellet_count": plant_counts,
-                    "plant_total_amount": plant_amounts,
-                    "plant_avg_scale": plant_avg_scales,
-                    "meat_pellet_count": meat_counts,
-                    "meat_total_amount": meat_amounts,
-                    "meat_avg_scale": meat_avg_scales,
-                })
-
-                # pellet_df.append(new_zones)
-                pellet_df = pd.concat([pellet_df, new_zones], ignore_index=True)
+                new_zones = summarize_pellets(pellets)
+                new_zones.insert(0, "update_time", update_time)
 
             except Exception as e:
                 print(f"Error processing Pellet Data: {e}")
                 return None
             
-            # --- Save the updated data for this simulation ---
-            save_dataframe(species_df, species_data_file)
-            save_dataframe(counts_df, species_counts_file)
-            save_dataframe(pellet_df, pellet_data_file)
-            
-            return sim_name  # Optionally return the sim_name for logging
+            # The parent process merges and saves the results so parallel workers never write the same files
+            return sim_name, new_species, new_counts, new_zones
     except Exception as e:
         print(f"Error processing {zip_path}: : {e}")
         return None
 
-def main():
-    processed_zips = load_processed_log(processed_log_file)
-    
+def save_sim_data(sim_name, species_chunks, counts_chunks, zone_chunks):
+    """
+    Merge the data extracted from a batch of ZIPs into the simulation's Parquet files.
+    Each file is loaded, concatenated and saved once per batch rather than once per ZIP.
+    species_chunks holds each ZIP's list of recordedSpecies records.
+    """
+    # Determine simulation folder and file paths
+    sim_folder = os.path.join(simulations_base_folder, sim_name)
+    species_data_file = os.path.join(sim_folder, "species_data.parquet")
+    species_counts_file = os.path.join(sim_folder, "species_counts.parquet")
+    pellet_data_file = os.path.join(sim_folder, "pellet_data.parquet")
+
+    # --- Load existing data for this simulation ---
+    pellet_df = load_dataframe(pellet_data_file)
+
+    # Species are keyed by speciesID; the first record seen wins, and species already saved are kept
+    saved_ids = set(load_dataframe(species_data_file, columns=["speciesID"])["speciesID"])
+    new_species = {}
+    for records in species_chunks:
+        for record in records:
+            if record["speciesID"] not in saved_ids:
+                new_species.setdefault(record["speciesID"], record)
+    pellet_df = pd.concat([pellet_df] + zone_chunks, ignore_index=True)
+
+    # --- Save the updated data for this simulation ---
+    # species_data.parquet is only rewritten when the batch recorded new species
+    if new_species:
+        species_df = load_dataframe(species_data_file)
+        species_df = pd.concat([species_df, pd.DataFrame.from_records(list(new_species.values()))], ignore_index=True)
+        save_dataframe(species_df, species_data_file)
+    # Counts are only appended: each new update_time gets its own partition
+    counts_chunks = [df for df in counts_chunks if not df.empty]
+    new_counts = pd.concat(counts_chunks, ignore_index=True) if counts_chunks else pd.DataFrame(columns=COUNTS_COLUMNS)
+    if counts_chunks:
+        save_counts(new_counts, species_counts_file)
+    save_dataframe(pellet_df, pellet_data_file)
+
+    # --- Snapshot of the latest metrics for the dashboard headers ---
+    update_latest_snapshot(sim_folder, len(saved_ids) + len(new_species), new_counts)
+
+class AutosaveHandler(FileSystemEventHandler):
+    """Queue the path of every ZIP that is written to the autosave folder."""
+
+    def __init__(self, zip_queue):
+        self.zip_queue = zip_queue
+
+    def queue_zip(self, path):
+        if path.lower().endswith(".zip"):
+            self.zip_queue.put(path)
+
+    def on_created(self, event):
+        if not event.is_directory:
+            self.queue_zip(event.src_path)
+
+    def on_moved(self, event):
+        # Covers saves written under a temporary name and renamed afterwards
+        if not event.is_directory:
+            self.queue_zip(event.dest_path)
+
+    def on_closed(self, event):
+        # Only raised on Linux; elsewhere wait_until_written covers files still being written
+        if not event.is_directory:
+            self.queue_zip(event.src_path)
+
+def wait_until_written(path, interval=1.0):
+    """Wait until the file's size stops changing. Returns False if the file disappeared."""
+    size = -1
     while True:
-        zip_files = [f for f in os.listdir(folder_path) if f.lower().endswith(".zip")]
-        
-        # print(folder_path)
-        new_files_found = False
-        for filename in zip_files:
-            if filename not in processed_zips:
-                zip_path = os.path.join(folder_path, filename)
-                sim_name = process_zip(zip_path)
-                processed_zips.add(filename)
-                new_files_found = True
-        if new_files_found:
-            update_processed_log(processed_log_file, processed_zips)
+        try:
+            current_size = os.path.getsize(path)
+        except OSError:
+            return False
+        if current_size == size:
+            return True
+        size = current_size
+        time.sleep(interval)
+
+def process_zips(executor, zip_paths, processed_zips):
+    """
+    Decode the ZIPs in parallel, then save the new data of each simulation once.
+    Only the ZIPs that were processed are added to the processed log; the paths of
+    the ZIPs that failed are returned so they can be retried.
+    """
+    futures = {executor.submit(process_zip, path): path for path in zip_paths}
+    failed_paths = []
+    # Collect every result of this batch per simulation, then save each simulation once
+    new_data = defaultdict(lambda: ([], [], []))
+    for future in as_completed(futures):
+        result = future.result()
+        if result is not None:
+            sim_name, new_species, new_counts, new_zones = result
+            species_chunks, counts_chunks, zone_chunks = new_data[sim_name]
+            species_chunks.append(new_species)
+            counts_chunks.append(new_counts)
+            zone_chunks.append(new_zones)
+            processed_zips.add(os.path.basename(futures[future]))
         else:
-            print("No new ZIP files found. Waiting...")
-        
-        # Use poll_interval from the config (in seconds)
-        time.sleep(poll_interval)
+            failed_paths.append(futures[future])
+    for sim_name, (species_chunks, counts_chunks, zone_chunks) in new_data.items():
+        save_sim_data(sim_name, species_chunks, counts_chunks, zone_chunks)
+    update_processed_log(processed_log_file, processed_zips)
+    return failed_paths
+
+def retry_failed(zip_queue, failed_paths, retries):
+    """Queue the failed ZIPs again after RETRY_DELAY seconds, until they used up MAX_RETRIES."""
+    for path in failed_paths:
+        retries[path] += 1
+        if retries[path] > MAX_RETRIES:
+            print(f"Giving up on {path} after {MAX_RETRIES} retries; it is retried on the next start.")
+            continue
+        print(f"Failed to process {path}; retrying in {RETRY_DELAY} seconds.")
+        timer = threading.Timer(RETRY_DELAY, zip_queue.put, args=(path,))
+        timer.daemon = True
+        timer.start()
+
+def main():
+    processed_zips = load_processed_log(processed_log_file)
+    # Number of failed attempts per ZIP path
+    retries = defaultdict(int)
+
+    # New autosaves are reported by filesystem events instead of polling the folder
+    zip_queue = queue.Queue()
+    observer = Observer()
+    observer.schedule(AutosaveHandler(zip_queue), folder_path, recursive=False)
+    observer.start()
+
+    try:
+        # Independent ZIPs are decoded in parallel; only this process writes the Parquet files
+        with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+            # Autosaves written while the monitor was not running
+            zip_paths = [
+                os.path.join(folder_path, filename)
+                for filename in os.listdir(folder_path)
+                if filename.lower().endswith(".zip") and filename not in processed_zips
+            ]
+            if zip_paths:
+                retry_failed(zip_queue, process_zips(executor, zip_paths, processed_zips), retries)
+            print("Waiting for new ZIP files...")
+
+            while True:
+                # The timeout keeps the wait interruptible with Ctrl+C on Windows
+                try:
+                    new_paths = {zip_queue.get(timeout=1)}
+                except queue.Empty:
+                    continue
+                # Saves that arrive together are processed as one batch
+                while not zip_queue.empty():
+                    new_paths.add(zip_queue.get())
+
+                zip_paths = [
+                    path for path in new_paths
+                    if os.path.basename(path) not in processed_zips and wait_until_written(path)
+                ]
+                if zip_paths:
+                    retry_failed(zip_queue, process_zips(executor, zip_paths, processed_zips), retries)
+    finally:
+        observer.stop()
+        observer.join()
 
 if __name__ == "__main__":
     main()
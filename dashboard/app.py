@@ -1,8 +1,17 @@
+import logging
 import dash
 import dash_bootstrap_components as dbc
-from layout import get_layout
-from callbacks import register_callbacks
-from utils import get_simulations_base_folder
+import plotly.io as pio
+from dashboard.layout import get_layout
+from dashboard.callbacks import register_callbacks
+from dashboard.utils import get_simulations_base_folder
+
+# Errors of the callbacks are logged with their traceback; the messages are only formatted when emitted
+logging.basicConfig(level=logging.WARNING, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+
+# Dash serializes every callback response with plotly's encoder; orjson (already a requirement)
+# encodes the figures several times faster than the json module
+pio.json.config.default_engine = "orjson"
 
 app = dash.Dash(__name__, external_stylesheets=[dbc.themes.DARKLY], suppress_callback_exceptions=True, title="Dibites")
 app.layout = get_layout()
@@ -13,5 +22,6 @@ app.my_config["SIMULATIONS_BASE_FOLDER"] = get_simulations_base_folder()
 
 register_callbacks(app)
 
+# Run on its own from the repository root with: python -m dashboard.app
 if __name__ == "__main__":
-    app.run_server(debug=True, port=8050)
+    app.run(debug=True, port=8050)
@@ -1,11 +1,14 @@
-from dash import Input, Output, dcc, html
-import pandas as pd
+from dash import Input, Output, State, dcc, html, ctx, no_update
 import os
-from utils import get_simulations_base_folder, get_update_frequency
-from tabs.sim_tab import get_sim_tab_content, register_sim_tab_callbacks
-from tabs.bibites_tab import get_bibites_tab_content, register_bibites_tab_callbacks
-from tabs.lineages_tab import get_lineages_tab_content, register_lineages_tab_callbacks
-from tabs.zones_tab import get_zones_tab_content, register_zones_tab_callbacks
+import logging
+import functools
+from dashboard.utils import get_simulations_base_folder, get_update_frequency, count_rows, count_alive_species, list_simulations, load_latest_snapshot, get_data_fingerprint
+from dashboard.tabs.sim_tab import get_sim_tab_content, register_sim_tab_callbacks
+from dashboard.tabs.bibites_tab import get_bibites_tab_content, register_bibites_tab_callbacks
+from dashboard.tabs.lineages_tab import get_lineages_tab_content, register_lineages_tab_callbacks
+from dashboard.tabs.zones_tab import get_zones_tab_content, register_zones_tab_callbacks
+
+logger = logging.getLogger(__name__)
 
 simulations_base_folder = get_simulations_base_folder()
 
@@ -17,41 +20,86 @@ def register_callbacks(app):
         Input("main-tabs", "value")  # Trigger update when tabs change
     )
     def update_simulation_dropdown(_):
-        base_folder = get_simulations_base_folder()
         try:
             simulations = [
                 {'label': sim, 'value': sim} 
-                for sim in os.listdir(base_folder) 
-                if os.path.isdir(os.path.join(base_folder, sim))
+                for sim in list_simulations(simulations_base_folder)
             ]
             default_sim = simulations[0]['value'] if simulations else None  # Select first available sim
             return simulations, default_sim
-        except Exception as e:
-            print(f"Error loading simulations: {e}")
+        except Exception:
+            logger.exception("Error loading simulations")
             return [], None
 
     ### **Show Sub-Tabs Only When "Bibite Analysis" is Selected** ###
-    @app.callback(
+    # Runs in the browser, so switching tabs needs no round trip to the server
+    app.clientside_callback(
+        """
+        function(selected_tab) {
+            return selected_tab === "bibite-analysis" ? {"display": "block"} : {"display": "none"};
+        }
+        """,
         Output("bibite-analysis-tabs-container", "style"),
         Input("main-tabs", "value")
     )
-    def show_bibite_analysis_subtabs(selected_tab):
-        """ Show sub-tabs only when 'Bibite Analysis' is selected """
-        return {'display': 'block'} if selected_tab == "bibite-analysis" else {'display': 'none'}
 
-    ### **Update Graph Data Without Refreshing the Page** ###
+    ### **Only Refresh While the Page Is Visible and a Simulation Is Selected** ###
+    # Runs in the browser, so a hidden tab or missing simulation costs no request to the server
+    app.clientside_callback(
+        """
+        function(n_intervals, sim_selected) {
+            if (document.hidden || !sim_selected) {
+                return window.dash_clientside.no_update;
+            }
+            return n_intervals;
+        }
+        """,
+        Output("refresh-tick", "data"),
+        Input("interval-component", "n_intervals"),
+        State("sim-dropdown", "value")
+    )
+
+    ### **Update Graph Data & Total/Alive Species Counts Without Refreshing the Page** ###
+    # One callback serves every interval tick, so the simulation's files are opened once per tick
     @app.callback(
-        Output("tab-content", "children"),
+        [Output("tab-content", "children"),
+         Output("content-fingerprint", "data"),
+         Output("total-species", "children"),
+         Output("alive-species", "children")],
         [Input("main-tabs", "value"),
          Input("bibite-tabs", "value"),
          Input("sim-dropdown", "value"),
-         Input("interval-component", "n_intervals")]  # Use interval for live updates
+         Input("refresh-tick", "data")],  # Interval ticks for live updates
+        State("content-fingerprint", "data")
     )
-    def update_graph_data(selected_main_tab, selected_sub_tab, sim_selected, n_intervals):
-        """ Update only the graph data without refreshing the entire layout """
+    def update_graph_data(selected_main_tab, selected_sub_tab, sim_selected, n_intervals, shown_fingerprint):
+        """ Update the graph data and the species counts without refreshing the entire layout """
         if not sim_selected:
-            return html.Div("Please select a simulation.")
+            return html.Div("Please select a simulation."), None, "Total Species Seen: N/A", "Alive Species: N/A"
 
+        sim_folder = os.path.join(simulations_base_folder, sim_selected)
+        snapshot = load_latest_snapshot(sim_folder)
+        data_fingerprint = get_data_fingerprint(sim_folder)
+        content_fingerprint = [selected_main_tab, selected_sub_tab, sim_selected, list(data_fingerprint)]
+        if ctx.triggered_id == "refresh-tick" and content_fingerprint == shown_fingerprint:
+            # The client already shows this content; sending it again would also reset the tab's dropdowns
+            tab_content = content_fingerprint = no_update
+        else:
+            tab_content = get_cached_tab_content(selected_main_tab, selected_sub_tab, sim_selected, data_fingerprint)
+        return (
+            tab_content,
+            content_fingerprint,
+            get_total_species_text(sim_folder, snapshot),
+            get_alive_species_text(sim_folder, snapshot),
+        )
+
+    # The content of a tab is built once per version of the simulation's data files,
+    # then every client and interval tick reuses the same component tree
+    @functools.lru_cache(maxsize=16)
+    def get_cached_tab_content(selected_main_tab, selected_sub_tab, sim_selected, data_fingerprint):
+        return get_tab_content(selected_main_tab, selected_sub_tab, sim_selected, 0)
+
+    def get_tab_content(selected_main_tab, selected_sub_tab, sim_selected, n_intervals):
         if selected_main_tab == "sim":
             return get_sim_tab_content(sim_selected, n_intervals, simulations_base_folder)  # Update Sim graphs
         if selected_main_tab == "zones":
@@ -66,47 +114,31 @@ def register_callbacks(app):
 
         return html.Div("Unknown tab selected.")
 
-    ### **Live Data Updates for Total & Alive Species Counts Without Refresh** ###
-    @app.callback(
-        Output("total-species", "children"),
-        [Input("sim-dropdown", "value"),
-         Input("interval-component", "n_intervals")]
-    )
-    def update_total_species(sim_selected, n_intervals):
-        if not sim_selected:
-            return "Total Species Seen: N/A"
-        sim_folder = os.path.join(simulations_base_folder, sim_selected)
+    def get_total_species_text(sim_folder, snapshot):
+        if snapshot:
+            return f"Total Species Seen: {snapshot['total_species']}"
         species_file = os.path.join(sim_folder, "species_data.parquet")
         try:
-            species_df = pd.read_parquet(species_file)
-            return f"Total Species Seen: {species_df.shape[0]}"
-        except Exception as e:
-            print(f"Error loading species data: {e}")
+            # Only the parquet footer is read
+            return f"Total Species Seen: {count_rows(species_file)}"
+        except Exception:
+            logger.exception("Error loading species data")
             return "Total Species Seen: 0"
 
-    @app.callback(
-        Output("alive-species", "children"),
-        [Input("sim-dropdown", "value"),
-         Input("interval-component", "n_intervals")]
-    )
-    def update_alive_species(sim_selected, n_intervals):
-        if not sim_selected:
-            return "Alive Species: N/A"
-        sim_folder = os.path.join(simulations_base_folder, sim_selected)
+    def get_alive_species_text(sim_folder, snapshot):
+        if snapshot and "alive_species" in snapshot:
+            return f"Alive Species: {snapshot['alive_species']}"
         counts_file = os.path.join(sim_folder, "species_counts.parquet")
         try:
-            counts_df = pd.read_parquet(counts_file)
-            if counts_df.empty:
-                return "Alive Species: 0"
-            max_update = counts_df['update_time'].max()
-            latest = counts_df[counts_df['update_time'] == max_update]
-            alive_species = (latest['count'] > 0).sum()
+            # Only the counts at the latest update time are read, and only when they changed
+            alive_species = count_alive_species(counts_file)
             return f"Alive Species: {alive_species}"
-        except Exception as e:
-            print(f"Error loading species counts: {e}")
+        except Exception:
+            logger.exception("Error loading species counts")
             return "Alive Species: 0"
 
     # Register additional tab-specific callbacks to ensure they function properly
     register_sim_tab_callbacks(app)
     register_bibites_tab_callbacks(app)
     register_lineages_tab_callbacks(app)
+    register_zones_tab_callbacks(app)
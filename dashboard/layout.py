@@ -1,6 +1,14 @@
 ﻿from dash import html, dcc
 import dash_bootstrap_components as dbc
-from utils import get_simulations_base_folder, get_update_frequency
+from dashboard.utils import get_simulations_base_folder, get_update_frequency
+
+# Shared style of every main tab and sub-tab
+_TAB_STYLE = {'backgroundColor': '#343a40', 'color': 'white', 'textAlign': 'center',
+              'display': 'flex', 'justifyContent': 'center', 'alignItems': 'center',
+              'padding': '5px 15px', 'lineHeight': '25px'}
+_TAB_SELECTED_STYLE = {**_TAB_STYLE, 'backgroundColor': '#212529'}
+# Style of the species counts in the header
+_COUNT_STYLE = {'color': 'white', 'fontSize': '18px', 'margin': '0'}
 
 def get_layout():
     # Header with title, simulation selector, and main tabs
@@ -42,6 +50,15 @@ def get_layout():
                 width="auto"
             ),
 
+            # Species counts of the selected simulation, refreshed with the tab content
+            dbc.Col(
+                html.Div([
+                    html.H3(id="total-species", style=_COUNT_STYLE),
+                    html.H3(id="alive-species", style=_COUNT_STYLE)
+                ]),
+                width="auto"
+            ),
+
             # Main Tabs (Reduced Height, Preserving Styling)
             dbc.Col(
                 dcc.Tabs(
@@ -51,32 +68,20 @@ def get_layout():
                         dcc.Tab(
                             label="Sim",
                             value="sim",
-                            style={'backgroundColor': '#343a40', 'color': 'white', 'textAlign': 'center',
-                                   'display': 'flex', 'justifyContent': 'center', 'alignItems': 'center',
-                                   'padding': '5px 15px', 'lineHeight': '25px'},
-                            selected_style={'backgroundColor': '#212529', 'color': 'white', 'textAlign': 'center',
-                                            'display': 'flex', 'justifyContent': 'center', 'alignItems': 'center',
-                                            'padding': '5px 15px', 'lineHeight': '25px'}
+                            style=_TAB_STYLE,
+                            selected_style=_TAB_SELECTED_STYLE
                         ),
                         dcc.Tab(
                             label="Zones",
                             value="zones",
-                            style={'backgroundColor': '#343a40', 'color': 'white', 'textAlign': 'center',
-                                   'display': 'flex', 'justifyContent': 'center', 'alignItems': 'center',
-                                   'padding': '5px 15px', 'lineHeight': '25px'},
-                            selected_style={'backgroundColor': '#212529', 'color': 'white', 'textAlign': 'center',
-                                            'display': 'flex', 'justifyContent': 'center', 'alignItems': 'center',
-                                            'padding': '5px 15px', 'lineHeight': '25px'}
+                            style=_TAB_STYLE,
+                            selected_style=_TAB_SELECTED_STYLE
                         ),
                         dcc.Tab(
                             label="Bibite Analysis",
                             value="bibite-analysis",
-                            style={'backgroundColor': '#343a40', 'color': 'white', 'textAlign': 'center',
-                                   'display': 'flex', 'justifyContent': 'center', 'alignItems': 'center',
-                                   'padding': '5px 15px', 'lineHeight': '25px'},
-                            selected_style={'backgroundColor': '#212529', 'color': 'white', 'textAlign': 'center',
-                                            'display': 'flex', 'justifyContent': 'center', 'alignItems': 'center',
-                                            'padding': '5px 15px', 'lineHeight': '25px'}
+                            style=_TAB_STYLE,
+                            selected_style=_TAB_SELECTED_STYLE
                         ),
                     ],
                     style={'backgroundColor': '#1c1e22', 'marginLeft': '20px'}
@@ -106,22 +111,14 @@ def get_layout():
                     dcc.Tab(
                         label="Bibites",
                         value="bibites",
-                        style={'backgroundColor': '#343a40', 'color': 'white', 'textAlign': 'center',
-                               'display': 'flex', 'justifyContent': 'center', 'alignItems': 'center',
-                               'padding': '5px 15px', 'lineHeight': '25px'},
-                        selected_style={'backgroundColor': '#212529', 'color': 'white', 'textAlign': 'center',
-                                        'display': 'flex', 'justifyContent': 'center', 'alignItems': 'center',
-                                        'padding': '5px 15px', 'lineHeight': '25px'}
+                        style=_TAB_STYLE,
+                        selected_style=_TAB_SELECTED_STYLE
                     ),
                     dcc.Tab(
                         label="Lineages",
                         value="lineages",
-                        style={'backgroundColor': '#343a40', 'color': 'white', 'textAlign': 'center',
-                               'display': 'flex', 'justifyContent': 'center', 'alignItems': 'center',
-                               'padding': '5px 15px', 'lineHeight': '25px'},
-                        selected_style={'backgroundColor': '#212529', 'color': 'white', 'textAlign': 'center',
-                                        'display': 'flex', 'justifyContent': 'center', 'alignItems': 'center',
-                                        'padding': '5px 15px', 'lineHeight': '25px'}
+                        style=_TAB_STYLE,
+                        selected_style=_TAB_SELECTED_STYLE
                     )
                 ],
                 style={'backgroundColor': '#1c1e22', 'marginTop': '10px'}
@@ -136,6 +133,10 @@ def get_layout():
         interval=get_update_frequency() * 1000,  # Update based on config settings
         n_intervals=0
     )
+    # Interval ticks that should refresh the data (skipped while the browser tab is hidden)
+    refresh_tick = dcc.Store(id="refresh-tick")
+    # Simulation, tabs and data fingerprint of the content this client is showing
+    content_fingerprint = dcc.Store(id="content-fingerprint")
 
     # Content area for tab-specific data
     tab_content = html.Div(id="tab-content", style={'padding': '20px'})
@@ -143,6 +144,8 @@ def get_layout():
     return html.Div([
         header,
         interval,
+        refresh_tick,
+        content_fingerprint,
         bibite_analysis_tabs,  # Add nested sub-tabs here
         tab_content
     ], style={'backgroundColor': '#212529'})
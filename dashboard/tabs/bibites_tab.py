@@ -1,13 +1,118 @@
-﻿from dash import dcc, html, Output, Input, State
-import pandas as pd
+﻿from dash import dcc, html, Output, Input, State, no_update
+from dash.exceptions import PreventUpdate
 import os
-import json
+import logging
+import functools
 import colorsys
 import numpy as np
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
-import networkx as nx
-from utils import load_species_data, get_simulations_base_folder, getNodeType
+from dashboard.utils import load_species_data, load_species_template, get_simulations_base_folder, getNodeType
+
+logger = logging.getLogger(__name__)
+
+# Static parts of the figure layouts, shared by every figure instead of rebuilt per call
+_NETWORK_LAYOUT = dict(
+    title="Neural Network Visualization",
+    template="plotly_dark",
+    showlegend=False,
+    xaxis_visible=False,
+    yaxis_visible=False,
+    margin=dict(l=50, r=50, t=50, b=50),
+)
+_GENE_BAR_LAYOUT = dict(template="plotly_dark", margin=dict(l=100, r=20, t=40, b=40))
+_GENE_PIE_LAYOUT = dict(template="plotly_dark", margin=dict(l=20, r=20, t=40, b=40))
+# yaxis2 is the secondary y axis make_subplots adds for the mutation sigmas
+_MUTATION_LAYOUT = dict(
+    title="Mutation Genes",
+    xaxis_title="",
+    yaxis_title_text="Mutation Count",
+    yaxis2_title_text="Mutation Simga",
+    template="plotly_dark",
+    margin=dict(l=100, r=20, t=50, b=20),
+)
+# Shown in place of a gene chart whose genes the species does not have, and of the
+# network graph while it is hidden; figures are never modified once returned
+_EMPTY_FIG = go.Figure()
+
+
+def weights_to_scaled_colors(weights):
+    """ Blend each weight's color from white to green (positive) or red (negative), all weights at once. """
+    weights = np.asarray(weights, dtype=np.float64)
+    fade = (255 * (1 - np.minimum(np.abs(weights), 1))).astype(np.uint8)  # Channels that fade out of white
+    full = np.full_like(fade, 255)
+    red = np.where(weights > 0, fade, full)
+    green = np.where(weights < 0, fade, full)
+    return [f"rgb({r},{g},{b})" for r, g, b in zip(red.tolist(), green.tolist(), fade.tolist())]
+
+# Synapse color of every weight bucket (weight * 16, rounded and clamped to -35..35), computed once at import
+_EDGE_COLORS = dict(zip(range(-35, 36), weights_to_scaled_colors(np.arange(-35, 36) / 16)))
+
+# Colors of the genes in each gene chart
+# Custom color mapping for WAG genes
+WAG_COLORS = {
+    "ArmorWAG": "#555555",   # Dark Grey
+    "FatWAG": "#FFD700",     # Gold
+    "MouthMusclesWAG": "#FF8C00",  # Deep Orange
+    "MoveMusclesWAG": "#FFA07A",   # Muted Salmon
+    "StomachWAG": "#228B22", # Forest Green
+    "ThroatWAG": "#DC143C",  # Crimson
+    "WombWAG": "#FF69B4",    # Hot Pink
+}
+
+COLOR_COLORS = {
+    "ColorR": "Red",
+    "ColorG": "Green",
+    "ColorB": "Blue"
+    }
+
+SENSE_COLORS = {
+    "ViewRadius": "#1f77b4",
+    "ViewAngle": "#ff7f0e",
+    "PheroSense": "#2ca02c"
+}
+
+REPRODUCTION_COLORS = {
+    "LayTime": "#d62728",
+    "BroodTime": "#9467bd",
+    "HatchTime": "#8c564b"
+}
+
+HERDING_COLORS = {
+    "HerdSeparationWeight": "#e377c2",
+    "HerdVelocityWeight": "#17becf",
+    "HerdAlignmentWeight": "#7f7f7f",
+    "HerdCohesionWeight": "#bcbd22"
+    }
+
+FAT_COLORS = {
+    "FatStorageDeadband":"#ff7f0e",
+    "FatStorageThreshold":"#e377c2"
+    }
+
+MUTATION_COUNT_COLORS = {
+    "AverageMutationNumber":"#1f77b4",
+    "BrainAverageMutation":"#ff7f0e"
+    }
+
+MUTATION_SIGMA_COLORS = {
+    "MutationAmountSigma":"Blue",
+    "BrainMutationSigma":"Red"
+    }
+
+# The chart each gene is shown in; HerdSeparationDistance and Diet are shown as text instead.
+# Genes not listed here go to the bar chart of the remaining genes.
+GENE_CHART_GROUPS = {gene: group for group, colors in {
+    "wag": WAG_COLORS,
+    "color": COLOR_COLORS,
+    "sense": SENSE_COLORS,
+    "reproduction": REPRODUCTION_COLORS,
+    "herding": HERDING_COLORS,
+    "fat": FAT_COLORS,
+    "mutation_count": MUTATION_COUNT_COLORS,
+    "mutation_sigma": MUTATION_SIGMA_COLORS,
+}.items() for gene in colors}
+GENE_CHART_GROUPS.update(HerdSeparationDistance=None, Diet=None)
 
 
 def get_bibites_tab_content(sim_selected, n_intervals, simulations_base_folder):
@@ -53,7 +158,6 @@ def get_bibites_tab_content(sim_selected, n_intervals, simulations_base_folder):
     genes_display = html.Div(id="bibites-genes-display", style={"padding": "20px", "color": "white"})
     nodes_display = html.Div(id="bibites-nodes-display", style={"padding": "20px", "color": "white"})
     synapses_display = html.Div(id="bibites-synapses-display", style={"padding": "20px", "color": "white"})
-    network_graph = dcc.Graph(id="bibites-network-graph")
 
     return html.Div(
         [
@@ -96,6 +200,9 @@ def get_bibites_tab_content(sim_selected, n_intervals, simulations_base_folder):
                     ),
                 ],
             ),
+
+            # Species, simulation and output node the charts above were built for
+            dcc.Store(id="bibites-state"),
         ],
         style={"padding": "20px"},
     )
@@ -105,15 +212,17 @@ def create_neural_network_graph(nodes, synapses, tooltip_points=3):
     """
     Generates a visual representation of a neural network using Plotly.
 
-    This function constructs a directed acyclic graph (DAG) representing the neural 
-    network of a selected bibite species. It:
+    This function draws the enabled synapses of a selected bibite species as a
+    directed graph. It:
     - Categorizes nodes as input, hidden, or output neurons.
-    - Positions nodes in a layered layout to improve readability.
+    - Places input nodes in the left column and output nodes in the right column.
+    - Places hidden nodes in columns between them by their depth among the hidden
+      nodes (see layer_nodes), so synapses between hidden nodes point to the right.
     - Creates edges (synapses) with colors and thickness based on synapse weights.
     - Includes interactive tooltips to display synapse weights.
 
-    The function also detects and removes cycles if any exist, ensuring the network
-    remains a valid DAG.
+    Cycles between hidden nodes are kept and drawn: the layering only ignores the
+    synapses that close a cycle, so those are the only ones that may point back left.
 
     Parameters:
     - nodes (list of dict): A list of neuron nodes, each containing:
@@ -130,44 +239,26 @@ def create_neural_network_graph(nodes, synapses, tooltip_points=3):
     Returns:
     - go.Figure: A Plotly figure displaying the neural network graph with nodes and 
       weighted edges.
-    """    
-    def weight_to_scaled_color(weight):
-        white = (255, 255, 255)
-        green = (0, 255, 0)
-        red = (255, 0, 0)
-        abs_weight = min(abs(weight), 1)
-        if weight > 0:
-            color = (
-                int(white[0] * (1 - abs_weight) + green[0] * abs_weight),
-                int(white[1] * (1 - abs_weight) + green[1] * abs_weight),
-                int(white[2] * (1 - abs_weight) + green[2] * abs_weight),
-            )
-        elif weight < 0:
-            color = (
-                int(white[0] * (1 - abs_weight) + red[0] * abs_weight),
-                int(white[1] * (1 - abs_weight) + red[1] * abs_weight),
-                int(white[2] * (1 - abs_weight) + red[2] * abs_weight),
-            )
-        else:
-            color = white
-        return f"rgb({color[0]},{color[1]},{color[2]})"
-    
-    # Create directed graph and add nodes
-    G = nx.DiGraph()
+    """
+    # The graph is kept in plain dicts
     input_nodes, hidden_nodes, output_nodes = [], [], []
-    connected_inputs = set()
     
-    # Add synapses (edges) and track connected input nodes
+    # Add the enabled synapses (edges) and track connected input nodes
+    edge_weights = {}
     for synapse in synapses:
         if synapse["En"] == True:
-            G.add_edge(synapse["NodeIn"], synapse["NodeOut"], weight=synapse["Weight"])
-            connected_inputs.add(synapse["NodeIn"])
+            edge_weights[(synapse["NodeIn"], synapse["NodeOut"])] = synapse["Weight"]
+    connected_inputs = {node_in for node_in, _ in edge_weights}
+    # Node order: the endpoints of the synapses as they first appear, then the remaining nodes
+    graph_nodes = dict.fromkeys(node_id for edge in edge_weights for node_id in edge)
     
+    node_attrs = {}
     for node in nodes:
         if node["Type"] == 0 and node["Index"] not in connected_inputs:
             continue  # Skip unconnected input nodes
         
-        G.add_node(node["Index"], desc=node["Desc"], activation=node.get("baseActivation", "N/A"), type = node["Type"])
+        node_attrs[node["Index"]] = {"desc": node["Desc"], "activation": node.get("baseActivation", "N/A"), "type": node["Type"]}
+        graph_nodes.setdefault(node["Index"])
         if node["Type"] == 0:
             input_nodes.append(node["Index"])
         elif "Hidden" in node["Desc"]:
@@ -175,6 +266,10 @@ def create_neural_network_graph(nodes, synapses, tooltip_points=3):
         else:
             output_nodes.append(node["Index"])
     
+    # Edges grouped by source node, with the sources in node order
+    node_order = {node_id: i for i, node_id in enumerate(graph_nodes)}
+    edges = sorted(edge_weights, key=lambda edge: node_order[edge[0]])
+    
     # Assign x-coordinates based on type and space hidden nodes
     positions = {}
     vertical_spacing = 5  # Increase this value to space out nodes more
@@ -187,23 +282,27 @@ def create_neural_network_graph(nodes, synapses, tooltip_points=3):
     positions.update(evenly_space(input_nodes, -2))
     positions.update(evenly_space(output_nodes, 2))
     
-    # Apply force-directed layout for hidden nodes while keeping them within bounds
+    # Sets make the per-node membership checks constant time
+    input_set, hidden_set = set(input_nodes), set(hidden_nodes)
+
+    # Hidden nodes are placed in columns by their depth among the hidden nodes, spread evenly between input and output
     if hidden_nodes:
-        pos_spring = nx.spring_layout(G, seed=42, k=0.3)  # Force-directed placement
-        for node in hidden_nodes:
-            x, y = pos_spring[node]
-            x = max(hidden_x_min, min(hidden_x_max, x))  # Ensure x stays between input and output
-            y *= vertical_spacing * 5  # Scale y spacing for better clarity
-            positions[node] = (x, y)
+        hidden_edges = [edge for edge in edges if edge[0] in hidden_set and edge[1] in hidden_set]
+        layers = layer_nodes(hidden_nodes, hidden_edges)
+        for depth, layer in enumerate(layers):
+            x = hidden_x_min + (hidden_x_max - hidden_x_min) * depth / (len(layers) - 1) if len(layers) > 1 else 0
+            positions.update(evenly_space(layer, x))
     
     node_x, node_y, node_labels, node_hovertexts, node_colors = [], [], [], [], []
     for node_id, (x, y) in positions.items():
         node_x.append(x)
         node_y.append(y)
-        #print(G.nodes[node_id]["type"])
-        node_labels.append(getNodeType(str(G.nodes[node_id]["type"])) if node_id in hidden_nodes else G.nodes[node_id]["desc"])
-        node_hovertexts.append(f"Name: {G.nodes[node_id]['desc']}<br>Type: {getNodeType(str(G.nodes[node_id]['type']))}<br>Activation: {G.nodes[node_id]['activation']}")
-        node_colors.append("cyan" if node_id in input_nodes else "orange" if node_id in hidden_nodes else "blue")
+        # The node's attributes and type name are looked up once for its label and hover text
+        attrs = node_attrs[node_id]
+        node_type = getNodeType(attrs["type"])
+        node_labels.append(node_type if node_id in hidden_set else attrs["desc"])
+        node_hovertexts.append(f"Name: {attrs['desc']}<br>Type: {node_type}<br>Activation: {attrs['activation']}")
+        node_colors.append("cyan" if node_id in input_set else "orange" if node_id in hidden_set else "blue")
     
     node_trace = go.Scatter(
         x=node_x, y=node_y,
@@ -215,32 +314,48 @@ def create_neural_network_graph(nodes, synapses, tooltip_points=3):
         hoverinfo="text"
     )
     
+    # Synapses with similar weights share one trace, since each trace adds a fixed cost to
+    # rendering and hovering the figure. Weights are rounded to 1/16, and beyond 35/16 the
+    # color, width and arrow size no longer change.
+    node_label_map = dict(zip(positions, node_labels))
+    edge_texts = [f"{node_label_map[u]} → {node_label_map[v]}<br>Weight: {edge_weights[(u, v)]:.2f}" for u, v in edges]
+
+    # The coordinates of all synapse ends are gathered from a (nodes, 2) array by row in one go
+    node_rows = {node_id: row for row, node_id in enumerate(positions)}
+    node_xy = np.array(list(positions.values()), dtype=np.float64).reshape(-1, 2)
+    start = node_xy[np.array([node_rows[u] for u, _ in edges], dtype=np.intp)].reshape(-1, 2)
+    end = node_xy[np.array([node_rows[v] for _, v in edges], dtype=np.intp)].reshape(-1, 2)
+    weights = np.array([edge_weights[edge] for edge in edges], dtype=np.float64)
+    # np.rint rounds halves to even like round()
+    buckets = np.clip(np.rint(weights * 16), -35, 35).astype(np.int64)
+    # Start, midpoint and end of every synapse, then NaN (null in the JSON) to separate it from the next one
+    segments = np.stack((start, (start + end) / 2, end, np.full_like(start, np.nan)), axis=1)
+
+    # Evenly spaced tooltip points along every synapse, computed for all synapses at once
+    steps = np.arange(1, tooltip_points + 1) / (tooltip_points + 1)
+    tooltip_x = (start[:, [0]] + (end[:, [0]] - start[:, [0]]) * steps).ravel()
+    tooltip_y = (start[:, [1]] + (end[:, [1]] - start[:, [1]]) * steps).ravel()
+    tooltip_text = [text for text in edge_texts for _ in range(tooltip_points)]
+
     edge_traces = []
-    tooltip_x, tooltip_y, tooltip_text = [], [], []
-    arrow_size = 0.02  # Adjust arrowhead size
-    for edge in G.edges:
-        x0, y0 = positions[edge[0]]
-        x1, y1 = positions[edge[1]]
-        weight = G[edge[0]][edge[1]]["weight"]
-        edge_color = weight_to_scaled_color(weight)
-        
+    for bucket in np.unique(buckets).tolist():
+        bucket_segments = segments[buckets == bucket]
+        edge_x, edge_y = bucket_segments[:, :, 0].ravel(), bucket_segments[:, :, 1].ravel()
+        weight = bucket / 16
+        edge_color = _EDGE_COLORS[bucket]
         edge_traces.append(
             go.Scatter(
-                x=[x0, (x0 + x1) / 2, x1],
-                y=[y0, (y0 + y1) / 2, y1],
+                x=edge_x,
+                y=edge_y,
                 mode="lines+markers",
                 line=dict(width=min(0.5 + 3.5 * abs(weight), 5), color=edge_color),
                 marker=dict(size=min(2+6*abs(weight),15), symbol="arrow-bar-up", angleref= "previous", color=edge_color),
                 hoverinfo="none"
             )
         )
-        
-        for i in range(1, tooltip_points + 1):
-            tooltip_x.append(x0 + (x1 - x0) * (i / (tooltip_points + 1)))
-            tooltip_y.append(y0 + (y1 - y0) * (i / (tooltip_points + 1)))
-            tooltip_text.append(f'{getNodeType(str(G.nodes[edge[0]]["type"])) if edge[0] in hidden_nodes else G.nodes[edge[0]]["desc"]} → {getNodeType(str(G.nodes[edge[1]]["type"])) if edge[1] in hidden_nodes else G.nodes[edge[1]]["desc"]}<br>Weight: {weight:.2f}')
-    
-    tooltip_trace = go.Scatter(
+
+    # WebGL picks the hovered point on the GPU, so hovering stays fast with many tooltip points
+    tooltip_trace = go.Scattergl(
         x=tooltip_x, y=tooltip_y,
         mode="markers",
         marker=dict(size=8, color="rgba(0,0,0,0)"),
@@ -251,19 +366,108 @@ def create_neural_network_graph(nodes, synapses, tooltip_points=3):
     fig = go.Figure(
         data=edge_traces + [tooltip_trace, node_trace],
         layout=go.Layout(
-            title="Neural Network Visualization",
-            template="plotly_dark",
-            showlegend=False,
+            **_NETWORK_LAYOUT,
             height=max(600, len(input_nodes) * 50 + 100),  # Adjust height based on input nodes
-            xaxis_visible=False,
-            yaxis_visible=False,
-            margin=dict(l=50, r=50, t=50, b=50),
         )
     )
 
     return fig
 
 
+def layer_nodes(nodes, edges):
+    """
+    Splits the nodes of a directed graph into layers by the longest path reaching them
+    (Kahn's algorithm), so every edge points to a later layer. O(V + E).
+
+    A synapse may close a cycle; when only cycles are left, the lowest remaining node is
+    placed next and the edges into it are ignored.
+
+    Parameters:
+    - nodes (list): The node ids.
+    - edges (list of tuple): (source, target) pairs between the nodes.
+
+    Returns:
+    - list of list: The node ids of each layer, starting with the nodes without incoming edges.
+    """
+    successors = {node: [] for node in nodes}
+    in_degree = dict.fromkeys(nodes, 0)
+    for source, target in edges:
+        if source != target:
+            successors[source].append(target)
+            in_degree[target] += 1
+
+    depth = dict.fromkeys(nodes, 0)
+    remaining = set(nodes)
+    ready = [node for node in nodes if in_degree[node] == 0]
+    while remaining:
+        if not ready:
+            ready.append(min(remaining))  # Break a cycle
+        node = ready.pop()
+        if node not in remaining:
+            continue
+        remaining.discard(node)
+        for target in successors[node]:
+            if target in remaining:
+                depth[target] = max(depth[target], depth[node] + 1)
+                in_degree[target] -= 1
+                if in_degree[target] == 0:
+                    ready.append(target)
+
+    layers = [[] for _ in range(max(depth.values(), default=-1) + 1)]
+    for node, node_depth in depth.items():
+        layers[node_depth].append(node)
+    return layers
+
+
+def ancestor_nodes(synapses, node):
+    """
+    Returns the set of nodes with a path of synapses to node, including node itself.
+
+    The search walks the synapses backwards one level at a time; each level is a single
+    NumPy selection over all synapses, so there is no Python loop over the edges.
+    """
+    sources = np.fromiter((synapse["NodeIn"] for synapse in synapses), dtype=np.int64, count=len(synapses))
+    targets = np.fromiter((synapse["NodeOut"] for synapse in synapses), dtype=np.int64, count=len(synapses))
+    reached = frontier = np.array([node], dtype=np.int64)
+    while frontier.size:
+        # Sources of the synapses into the last level that were not reached before
+        frontier = np.setdiff1d(sources[np.isin(targets, frontier)], reached)
+        reached = np.union1d(reached, frontier)
+    return set(reached.tolist())
+
+
+@functools.lru_cache(maxsize=64)
+def _build_network_graph(species_file, species_id, selected_output_node, mtime_ns, size):
+    template = load_species_template(species_file, species_id)
+    nodes = template.get("nodes", [])
+    synapses = template.get("synapses", [])
+
+    # If "Show Full Graph" is selected, show the full network
+    if not selected_output_node:
+        filtered_nodes, filtered_synapses = nodes, synapses
+    else:
+        # Find all nodes leading to the selected output node, including standalone output nodes
+        reachable_nodes = ancestor_nodes(synapses, int(selected_output_node))
+
+        # Filter nodes and synapses
+        filtered_nodes = [n for n in nodes if n["Index"] in reachable_nodes]
+        filtered_synapses = [s for s in synapses if s["NodeIn"] in reachable_nodes and s["NodeOut"] in reachable_nodes]
+
+    return create_neural_network_graph(filtered_nodes, filtered_synapses).to_dict()
+
+
+def get_network_graph(species_file, species_id, selected_output_node):
+    """
+    Returns the neural network figure of a species as a plain dict, filtered to the nodes
+    leading to selected_output_node ("" for the full graph).
+
+    The figure is cached until species_data.parquet changes, so reselecting a species or
+    output node reuses it. The returned dict is shared and must not be modified.
+    """
+    stat = os.stat(species_file)
+    return _build_network_graph(species_file, int(species_id), selected_output_node or "", stat.st_mtime_ns, stat.st_size)
+
+
 def create_gene_bar_chart(gene_data):
     """
     Generates a bar chart and a pie chart to visualize gene expression in a species.
@@ -282,323 +486,253 @@ def create_gene_bar_chart(gene_data):
       gene expression levels (float or convertible to float).
 
     Returns:
-    - tuple (go.Figure, go.Figure): A tuple containing:
-        - The first figure (bar chart) showing all gene values.
-        - The second figure (pie chart) showing WAG gene distribution. If no WAG genes 
-          are present, an empty figure is returned.
+    - tuple of 8 go.Figure: The bar chart of the remaining genes, the WAG and color pies,
+      and the sense, reproduction, herding, fat and mutation charts. A chart whose genes
+      are not present is returned as the shared empty figure.
     """
     if not gene_data:
-        return go.Figure(), go.Figure()
-
-    # Define custom color mapping for WAG genes
-    wag_colors = {
-        "ArmorWAG": "#555555",   # Dark Grey
-        "FatWAG": "#FFD700",     # Gold
-        "MouthMusclesWAG": "#FF8C00",  # Deep Orange
-        "MoveMusclesWAG": "#FFA07A",   # Muted Salmon
-        "StomachWAG": "#228B22", # Forest Green
-        "ThroatWAG": "#DC143C",  # Crimson
-        "WombWAG": "#FF69B4",    # Hot Pink
-    }
-
-    color_colors = {
-        "ColorR": "Red",
-        "ColorG": "Green",
-        "ColorB": "Blue"
-        }
-
-    sense_colors = {
-        "ViewRadius": "#1f77b4",
-        "ViewAngle": "#ff7f0e",
-        "PheroSense": "#2ca02c"
-    }
-
-    reproduction_colors = {
-        "LayTime": "#d62728",
-        "BroodTime": "#9467bd",
-        "HatchTime": "#8c564b"
-    }
-
-    herding_colors = {
-        "HerdSeparationWeight": "#e377c2",
-        "HerdVelocityWeight": "#17becf",
-        "HerdAlignmentWeight": "#7f7f7f",
-        "HerdCohesionWeight": "#bcbd22"
-        }
-
-    fat_colors = {
-        "FatStorageDeadband":"#ff7f0e",
-        "FatStorageThreshold":"#e377c2"
-        }
-
-    mutation_count_colors = {
-        "AverageMutationNumber":"#1f77b4",
-        "BrainAverageMutation":"#ff7f0e"
-        }
-
-    mutation_sigma_colors = {
-        "MutationAmountSigma":"Blue",
-        "BrainMutationSigma":"Red"
-        }
-
-
-
-    # Filter WAG genes
-    wag_genes = {gene: round(value, 2) for gene, value in gene_data.items() if gene in wag_colors}
-    color_genes = {gene: round(value, 2) for gene, value in gene_data.items() if gene in color_colors}
-    sense_genes = {gene: round(value, 2) for gene, value in gene_data.items() if gene in sense_colors}
-    reproduction_genes = {gene: round(value, 2) for gene, value in gene_data.items() if gene in reproduction_colors}
-    herding_genes = {gene: round(value, 2) for gene, value in gene_data.items() if gene in herding_colors}
-    fat_genes = {gene: round(value, 2) for gene, value in gene_data.items() if gene in fat_colors}
-    mutation_count_genes = {gene: round(value, 2) for gene, value in gene_data.items() if gene in mutation_count_colors}
-    mutation_sigma_genes = {gene: round(value, 2) for gene, value in gene_data.items() if gene in mutation_sigma_colors}
-    bar_genes = {gene: round(value, 2) for gene, value in gene_data.items() if (gene not in wag_colors and gene not in color_colors and gene not in sense_colors and gene not in reproduction_colors and gene not in herding_colors and gene != "HerdSeparationDistance" and gene not in fat_colors and gene != "Diet" and gene not in mutation_count_colors  and gene not in mutation_sigma_colors)}
-
+        return (_EMPTY_FIG,) * 8
+
+    # Route every rounded gene value to its chart in a single pass over the genes
+    grouped_genes = {group: {} for group in ("wag", "color", "sense", "reproduction", "herding", "fat", "mutation_count", "mutation_sigma", "bar")}
+    for gene, value in gene_data.items():
+        group = GENE_CHART_GROUPS.get(gene, "bar")
+        if group is not None:
+            grouped_genes[group][gene] = round(value, 2)
+    wag_genes = grouped_genes["wag"]
+    color_genes = grouped_genes["color"]
+    sense_genes = grouped_genes["sense"]
+    reproduction_genes = grouped_genes["reproduction"]
+    herding_genes = grouped_genes["herding"]
+    fat_genes = grouped_genes["fat"]
+    mutation_count_genes = grouped_genes["mutation_count"]
+    mutation_sigma_genes = grouped_genes["mutation_sigma"]
+    bar_genes = grouped_genes["bar"]
+
+    # Each figure is built in one constructor call, so its traces and layout are validated once
     # Create the bar chart
-    bar_chart = go.Figure()
-    bar_chart.add_trace(
-        go.Bar(
-            x=list(bar_genes.values()),
-            y=list(bar_genes.keys()),
-            orientation="h",
-            marker=dict(color="blue"),
-        )
-    )
-    bar_chart.update_layout(
-        title="Gene Values for Selected Species",
-        xaxis_title="Gene Value",
-        yaxis_title="Gene Name",
-        template="plotly_dark",
-        margin=dict(l=100, r=20, t=40, b=40),
+    bar_chart = go.Figure(
+        data=[
+            go.Bar(
+                x=list(bar_genes.values()),
+                y=list(bar_genes.keys()),
+                orientation="h",
+                marker=dict(color="blue"),
+            )
+        ],
+        layout=dict(
+            title="Gene Values for Selected Species",
+            xaxis_title="Gene Value",
+            yaxis_title="Gene Name",
+            **_GENE_BAR_LAYOUT,
+        ),
     )
 
-    sense_bar = go.Figure()
-    sense_bar.add_trace(
-        go.Bar(
-            y=list(sense_genes.values()),
-            x=list(sense_genes.keys()),
-            orientation="v",
-            marker=dict(color=[sense_colors[gene] for gene in sense_colors.keys()]),
-        )
-    )
-    sense_bar.update_layout(
-        title="Sense Genes",
-        xaxis_title="Gene Value",
-        yaxis_title="Gene Name",
-        template="plotly_dark",
-        margin=dict(l=100, r=20, t=40, b=40),
+    sense_bar = go.Figure(
+        data=[
+            go.Bar(
+                y=list(sense_genes.values()),
+                x=list(sense_genes.keys()),
+                orientation="v",
+                marker=dict(color=[SENSE_COLORS[gene] for gene in sense_genes.keys()]),
+            )
+        ],
+        layout=dict(
+            title="Sense Genes",
+            xaxis_title="Gene Value",
+            yaxis_title="Gene Name",
+            **_GENE_BAR_LAYOUT,
+        ),
     )
 
     if wag_genes:
         # Create the pie chart
-        wag_pie = go.Figure()
-        wag_pie.add_trace(
-            go.Pie(
-                labels=list(wag_genes.keys()),
-                values=list(wag_genes.values()),
-                textinfo="label+value+percent",
-                hole=0.3,
-                marker=dict(colors=[wag_colors[gene] for gene in wag_genes.keys()]),
-            )
-        )
-        wag_pie.update_layout(
-            title="WAG Gene Distribution",
-            template="plotly_dark",
-            margin=dict(l=20, r=20, t=40, b=40),
+        wag_pie = go.Figure(
+            data=[
+                go.Pie(
+                    labels=list(wag_genes.keys()),
+                    values=list(wag_genes.values()),
+                    textinfo="label+value+percent",
+                    hole=0.3,
+                    marker=dict(colors=[WAG_COLORS[gene] for gene in wag_genes.keys()]),
+                )
+            ],
+            layout=dict(
+                title="WAG Gene Distribution",
+                **_GENE_PIE_LAYOUT,
+            ),
         )
     else:
-        pie_chart = go.Figure()
+        wag_pie = _EMPTY_FIG
 
     if color_genes:
-        color_pie = go.Figure()
-        color_pie.add_trace(
-            go.Pie(
-                labels=list(color_genes.keys()),
-                values=list(color_genes.values()),
-                textinfo="label+value",
-                hole=0.3,
-                marker=dict(colors=[color_colors[gene] for gene in color_genes.keys()]),
-            )
-        )
-        color_pie.update_layout(
-            title="Color Distribution",
-            template="plotly_dark",
-            margin=dict(l=20, r=20, t=40, b=40),
+        color_pie = go.Figure(
+            data=[
+                go.Pie(
+                    labels=list(color_genes.keys()),
+                    values=list(color_genes.values()),
+                    textinfo="label+value",
+                    hole=0.3,
+                    marker=dict(colors=[COLOR_COLORS[gene] for gene in color_genes.keys()]),
+                )
+            ],
+            layout=dict(
+                title="Color Distribution",
+                **_GENE_PIE_LAYOUT,
+            ),
         )
     else:
-        color_pie = go.Figure()
+        color_pie = _EMPTY_FIG
 
-    if reproduction_colors:
-        reproduction_bar = go.Figure()
-        for cat, value in reproduction_genes.items():
-            reproduction_bar.add_trace(
+    if reproduction_genes:
+        reproduction_bar = go.Figure(
+            data=[
                 go.Bar(
                     name = cat,
                     x=['Stage'],
                     y=[value],
-                    marker = dict(color = reproduction_colors[cat])
+                    marker = dict(color = REPRODUCTION_COLORS[cat])
                 )
-            )
-    reproduction_bar.update_layout(
-        title="Reproduction Genes",
-        xaxis_title="",
-        yaxis_title="Time",
-        barmode= 'stack',
-        template="plotly_dark",
-        margin=dict(l=100, r=20, t=40, b=40),
-    )
-
-    herding_bar = go.Figure()
-    herding_bar.add_trace(
-        go.Bar(
-            y=list(herding_genes.values()),
-            x=list(herding_genes.keys()),
-            orientation="v",
-            marker=dict(color=[herding_colors[gene] for gene in herding_genes.keys()]),
+                for cat, value in reproduction_genes.items()
+            ],
+            layout=dict(
+                title="Reproduction Genes",
+                xaxis_title="",
+                yaxis_title="Time",
+                barmode= 'stack',
+                **_GENE_BAR_LAYOUT,
+            ),
         )
-    )
-    herding_bar.update_layout(
-        title="Herding Genes",
-        xaxis_title="Value",
-        yaxis_title="Gene Name",
-        template="plotly_dark",
-        margin=dict(l=100, r=20, t=40, b=40),
-    )
+    else:
+        reproduction_bar = _EMPTY_FIG
 
-    if fat_colors:
-        fat_bar = go.Figure()
-        fat_bar.add_trace(
-            go.Bar(
-                name = "Fat to Energy",
-                x=['Energy'],
-                y=[fat_genes["FatStorageDeadband"]],
-                marker = dict(color = fat_colors["FatStorageDeadband"]),
-                hovertemplate=f"Energy: {fat_genes['FatStorageDeadband']}"
-            )
-        )
-        fat_bar.add_trace(
+    herding_bar = go.Figure(
+        data=[
             go.Bar(
-                name = "No conversion",
-                x=['Energy'],
-                y=[ fat_genes["FatStorageThreshold"] - fat_genes["FatStorageDeadband"]],
-                marker = dict(color = "#7f7f7f"),
-                hovertemplate=f"Energy: {fat_genes['FatStorageDeadband']} - {fat_genes['FatStorageThreshold']}"
+                y=list(herding_genes.values()),
+                x=list(herding_genes.keys()),
+                orientation="v",
+                marker=dict(color=[HERDING_COLORS[gene] for gene in herding_genes.keys()]),
             )
-        )
-        fat_bar.add_trace(
-            go.Bar(
-                name = "Energy to Fat",
-                x=['Energy'],
-                y=[1 - fat_genes["FatStorageThreshold"]],
-                marker = dict(color = "#bcbd22"),
-                hovertemplate=f"Energy: {fat_genes['FatStorageThreshold']}"
-            )
-        )
-        fat_bar.update_layout(
-            title="Fat Conversion Genes",
-            xaxis_title="",
-            yaxis_title="Energy Level",
-            barmode= 'stack',
-            template="plotly_dark",
-            margin=dict(l=100, r=20, t=40, b=40),
-        )
+        ],
+        layout=dict(
+            title="Herding Genes",
+            xaxis_title="Value",
+            yaxis_title="Gene Name",
+            **_GENE_BAR_LAYOUT,
+        ),
+    )
 
-    if mutation_count_colors:
-        mutation_bar = go.Figure()
-        mutation_bar = make_subplots(specs=[[{"secondary_y": True}]])
-        mutation_bar.add_trace(
-            go.Bar(
-                name = "Number",
-                x=['Brain Mutation'],
-                y=[mutation_count_genes["BrainAverageMutation"]],
-                marker = dict(color = mutation_count_colors["BrainAverageMutation"]),
-            ),
-            secondary_y=False
-        )
-        mutation_bar.add_trace(
-            go.Bar(
-                name = "Number",
-                x=['Average Mutation'],
-                y=[mutation_count_genes["AverageMutationNumber"]],
-                marker = dict(color = mutation_count_colors["AverageMutationNumber"]),
-            ),
-            secondary_y=False
-        )
-        mutation_bar.add_trace(
-            go.Scatter(
-                name = "Sigma",
-                x=['Brain Mutation'],
-                y=[mutation_sigma_genes["BrainMutationSigma"]],
-                marker = dict(color = mutation_sigma_colors["BrainMutationSigma"]),
-            ),
-            secondary_y=True
-        )
-        mutation_bar.add_trace(
-            go.Scatter(
-                name = "Sigma",
-                x=['Average Mutation'],
-                y=[mutation_sigma_genes["MutationAmountSigma"]],
-                marker = dict(color = mutation_sigma_colors["MutationAmountSigma"]),
+    if fat_genes:
+        fat_bar = go.Figure(
+            data=[
+                go.Bar(
+                    name = "Fat to Energy",
+                    x=['Energy'],
+                    y=[fat_genes["FatStorageDeadband"]],
+                    marker = dict(color = FAT_COLORS["FatStorageDeadband"]),
+                    hovertemplate=f"Energy: {fat_genes['FatStorageDeadband']}"
+                ),
+                go.Bar(
+                    name = "No conversion",
+                    x=['Energy'],
+                    y=[ fat_genes["FatStorageThreshold"] - fat_genes["FatStorageDeadband"]],
+                    marker = dict(color = "#7f7f7f"),
+                    hovertemplate=f"Energy: {fat_genes['FatStorageDeadband']} - {fat_genes['FatStorageThreshold']}"
+                ),
+                go.Bar(
+                    name = "Energy to Fat",
+                    x=['Energy'],
+                    y=[1 - fat_genes["FatStorageThreshold"]],
+                    marker = dict(color = "#bcbd22"),
+                    hovertemplate=f"Energy: {fat_genes['FatStorageThreshold']}"
+                ),
+            ],
+            layout=dict(
+                title="Fat Conversion Genes",
+                xaxis_title="",
+                yaxis_title="Energy Level",
+                barmode= 'stack',
+                **_GENE_BAR_LAYOUT,
             ),
-            secondary_y=True
         )
-        mutation_bar.update_layout(
-            title="Mutation Genes",
-            xaxis_title="",
-            template="plotly_dark",
-            margin=dict(l=100, r=20, t=50, b=20),
+    else:
+        fat_bar = _EMPTY_FIG
+
+    if mutation_count_genes and mutation_sigma_genes:
+        mutation_bar = make_subplots(specs=[[{"secondary_y": True}]])
+        # The counts go on the primary y axis and the sigmas on the secondary one, added in one call
+        mutation_bar.add_traces(
+            [
+                go.Bar(
+                    name = "Number",
+                    x=['Brain Mutation'],
+                    y=[mutation_count_genes["BrainAverageMutation"]],
+                    marker = dict(color = MUTATION_COUNT_COLORS["BrainAverageMutation"]),
+                ),
+                go.Bar(
+                    name = "Number",
+                    x=['Average Mutation'],
+                    y=[mutation_count_genes["AverageMutationNumber"]],
+                    marker = dict(color = MUTATION_COUNT_COLORS["AverageMutationNumber"]),
+                ),
+                go.Scatter(
+                    name = "Sigma",
+                    x=['Brain Mutation'],
+                    y=[mutation_sigma_genes["BrainMutationSigma"]],
+                    marker = dict(color = MUTATION_SIGMA_COLORS["BrainMutationSigma"]),
+                ),
+                go.Scatter(
+                    name = "Sigma",
+                    x=['Average Mutation'],
+                    y=[mutation_sigma_genes["MutationAmountSigma"]],
+                    marker = dict(color = MUTATION_SIGMA_COLORS["MutationAmountSigma"]),
+                ),
+            ],
+            secondary_ys=[False, False, True, True],
         )
-        mutation_bar.update_yaxes(title_text = "Mutation Count", secondary_y = False)
-        mutation_bar.update_yaxes(title_text = "Mutation Simga", secondary_y = True)
+        mutation_bar.update_layout(_MUTATION_LAYOUT)
+    else:
+        mutation_bar = _EMPTY_FIG
     return bar_chart, wag_pie, color_pie, sense_bar, reproduction_bar, herding_bar, fat_bar, mutation_bar
 
 
-def get_gene_bar_chart(sim_selected, species_id, simulations_base_folder):
-    """
-    Retrieves gene data for a selected species and generates corresponding visualizations.
+@functools.lru_cache(maxsize=64)
+def _build_gene_figures(species_file, species_id, mtime_ns, size):
+    template = load_species_template(species_file, species_id)
+    return tuple(fig.to_dict() for fig in create_gene_bar_chart(template.get("genes", {})))
 
-    This function:
-    - Loads gene expression data from the simulation files.
-    - Generates a bar chart for all gene values.
-    - Creates a pie chart specifically for WAG genes.
-    - Ensures robust error handling for missing or malformed data.
-
-    Parameters:
-    - sim_selected (str): The name of the selected simulation.
-    - species_id (int or str): The unique identifier of the selected species.
-    - simulations_base_folder (str): The base directory containing simulation data.
 
-    Returns:
-    - html.Div: A Dash layout containing:
-        - A bar chart visualizing gene values.
-        - A pie chart for WAG gene distribution (if applicable).
-        - If no data is found, an appropriate message is displayed instead.
+def get_gene_figures(species_file, species_id):
     """
-    if not sim_selected or not species_id:
-        return html.Div("Please select a species.")
-
-    # Load species data using the helper function
-    species_df, _ = load_species_data(sim_selected, simulations_base_folder)
+    Returns the figures of create_gene_bar_chart for a species as plain dicts.
 
-    try:
-        # Find the row corresponding to the selected species
-        species_row = species_df[species_df["speciesID"] == species_id]
+    The figures are cached until species_data.parquet changes, so Dash only has to encode
+    the dicts when a species is shown again. The returned dicts are shared and must not be modified.
+    """
+    stat = os.stat(species_file)
+    return _build_gene_figures(species_file, int(species_id), stat.st_mtime_ns, stat.st_size)
 
-        if species_row.empty:
-            return html.Div("No gene data available for the selected species.")
 
-        # Extract genes from JSON
-        template = species_row.iloc[0].get("template")
-        if isinstance(template, str):
-            template = json.loads(template)
+def render_gene_chart(gene_data, species_file, species_id):
+    """
+    Lays out the gene charts of a species from its already loaded genes.
 
-        gene_data = template.get("genes", {})
+    Parameters:
+    - gene_data (dict): The "genes" of the species template, mapping gene names to values.
+    - species_file (str): The species_data.parquet the genes were loaded from.
+    - species_id (int or str): The unique identifier of the species.
 
-        if not gene_data:
-            return html.Div("No genes found for this species.")
+    Returns:
+    - html.Div: A Dash layout with the gene bar, pie and stacked charts, or a message
+      if there are no genes.
+    """
+    if not gene_data:
+        return html.Div("No genes found for this species.")
 
-        # Generate bar and pie charts
-        bar_chart, wag_pie, color_pie, sense_bar, reproduction_bar, herding_bar, fat_bar, mutation_bar = create_gene_bar_chart(gene_data)
+    try:
+        # Generate bar and pie charts, or reuse them if this version of the species was already shown
+        bar_chart, wag_pie, color_pie, sense_bar, reproduction_bar, herding_bar, fat_bar, mutation_bar = get_gene_figures(species_file, species_id)
 
         diet_cat =""
         if gene_data['Diet'] <= .14:
@@ -736,8 +870,8 @@ def get_gene_bar_chart(sim_selected, species_id, simulations_base_folder):
             ]
         )
 
-    except Exception as e:
-        print(f"Error generating gene bar and pie charts: {e}")
+    except Exception:
+        logger.exception("Error generating gene bar and pie charts")
         return html.Div("Error loading gene data.")
 
 
@@ -777,56 +911,32 @@ def register_bibites_tab_callbacks(app):
         species_file = os.path.join(sim_folder, "species_data.parquet")
 
         try:
-            species_df = pd.read_parquet(species_file)
-            species_row = species_df[species_df["speciesID"] == selected_species]
+            template = load_species_template(species_file, selected_species)
 
-            if species_row.empty:
-                print("No species data found.")
+            if template is None:
+                logger.warning("No species data found for species %s", selected_species)
                 return [{"label": "Show Full Graph", "value": ""}], ""
 
-            # Load template safely (ensure it's a dictionary)
-            template = species_row.iloc[0]["template"]
-            if isinstance(template, str):
-                template = json.loads(template)
-
             nodes = template.get("nodes", [])
             synapses = template.get("synapses", [])
 
             #print(f"Retrieved {len(nodes)} nodes and {len(synapses)} synapses.")
 
             if len(nodes) == 0:
-                print("No nodes found in template.")
+                logger.warning("No nodes found in the template of species %s", selected_species)
                 return [{"label": "Show Full Graph", "value": ""}], ""
 
-            # Ensure all node properties are standard Python types
-            def clean_value(value):
-                """ Convert NumPy arrays or lists to standard Python single values. """
-                if isinstance(value, np.ndarray):
-                    return value.item() if value.size == 1 else value.tolist()
-                return value
-
-            # Convert all node properties to standard Python types
-            for node in nodes:
-                node["Index"] = clean_value(node.get("Index"))
-                node["Desc"] = clean_value(node.get("Desc", "Unknown"))
-                node["Type"] = clean_value(node.get("Type"))
-
-            # Create a directed graph from synapses
-            G = nx.DiGraph()
-            for synapse in synapses:
-                G.add_edge(clean_value(synapse["NodeIn"]), clean_value(synapse["NodeOut"]))
-
             # Identify output nodes based on criteria:
             # - Type > 0 (not input)
             # - "Hidden" should NOT be in the description
             output_nodes = [
                 node for node in nodes
-                if node["Type"] > 0 and "Hidden" not in node["Desc"]
+                if node["Type"] > 0 and "Hidden" not in node.get("Desc", "Unknown")
             ]
 
             # Extract details for the output nodes
             dropdown_options = [
-                {"label": f"{node['Index']} - {node['Desc']}", "value": str(node["Index"])}
+                {"label": f"{node['Index']} - {node.get('Desc', 'Unknown')}", "value": str(node["Index"])}
                 for node in output_nodes
             ]
 
@@ -835,8 +945,8 @@ def register_bibites_tab_callbacks(app):
 
             return options, ""  # Default value is "Show Full Graph"
 
-        except Exception as e:
-            print(f"Error loading output nodes: {e}")
+        except Exception:
+            logger.exception("Error loading output nodes")
             return [{"label": "Show Full Graph", "value": ""}], ""
 
 
@@ -862,110 +972,65 @@ def register_bibites_tab_callbacks(app):
             Output("gene-bar-chart", "style"),
             Output("bibites-network-graph", "figure"),
             Output("network-graph-container", "style"),
+            Output("bibites-state", "data"),
         ],
         [
             Input("bibites-dropdown", "value"),
             Input("sim-dropdown", "value"),
             Input("output-node-dropdown", "value")  # Capture dropdown selection
-        ]
+        ],
+        State("bibites-state", "data")
     )
-    def update_gene_and_network_graph(selected_species, sim_selected, selected_output_node):
+    def update_gene_and_network_graph(selected_species, sim_selected, selected_output_node, shown_inputs):
+        """
+        Updates the Gene Bar Chart and Neural Network Graph unless they already show the selected inputs,
+        e.g. when the simulation dropdown is set again to the same simulation.
+        When only the output node changed, the gene charts on the page are kept and only the graph is sent.
+        """
+        current_inputs = [selected_species, sim_selected, selected_output_node]
+        if current_inputs == shown_inputs:
+            raise PreventUpdate
+        with_genes = not shown_inputs or current_inputs[:2] != shown_inputs[:2]
+        return (*build_gene_and_network_graph(selected_species, sim_selected, selected_output_node, with_genes), current_inputs)
+
+    def build_gene_and_network_graph(selected_species, sim_selected, selected_output_node, with_genes=True):
         """
-        Updates the Gene Bar Chart and Neural Network Graph dynamically.
-        Uses `load_species_data` for efficiency.
+        Builds the Gene Bar Chart and Neural Network Graph.
+        Uses `load_species_template`, so only the selected species' template is decoded.
         Filters the graph if an output node is selected but ensures standalone output nodes still appear.
+        With with_genes=False the gene charts and their style are returned as no_update.
         """
 
         if not sim_selected or not selected_species:
-            return html.Div("Please select a species."), {"display": "none"}, go.Figure(), {"display": "none"}
+            return html.Div("Please select a species."), {"display": "none"}, _EMPTY_FIG, {"display": "none"}
 
         simulations_base_folder = get_simulations_base_folder()
-    
-        # Load species data using the helper function
-        species_df, _ = load_species_data(sim_selected, simulations_base_folder)
+        species_file = os.path.join(simulations_base_folder, sim_selected, "species_data.parquet")
 
         try:
-            # Find the row corresponding to the selected species
-            species_row = species_df[species_df["speciesID"] == selected_species]
-
-            if species_row.empty:
-                return html.Div("No data available."), {"display": "none"}, go.Figure(), {"display": "none"}
-
-            # Load species template (Ensure it's a dictionary)
-            template = species_row.iloc[0]["template"]
-            if isinstance(template, str):
-                template = json.loads(template)
-
-            nodes = template.get("nodes", [])
-            synapses = template.get("synapses", [])
-
-            if len(nodes) == 0:
-                return html.Div("No network data available."), {"display": "none"}, go.Figure(), {"display": "none"}
-
-            # Convert node and synapse properties to standard Python types
-            def clean_value(value):
-                """ Convert NumPy arrays or lists to standard Python single values. """
-                if isinstance(value, np.ndarray):
-                    return value.item() if value.size == 1 else value.tolist()
-                return value
-
-            for node in nodes:
-                node["Index"] = clean_value(node.get("Index"))
-                node["Desc"] = clean_value(node.get("Desc", "Unknown"))
-
-            cleaned_synapses = [
-                {
-                    "NodeIn": clean_value(synapse["NodeIn"]),
-                    "NodeOut": clean_value(synapse["NodeOut"]),
-                    "Weight": clean_value(synapse.get("Weight", 0)),
-                    "En": clean_value(synapse["En"])
-                }
-                for synapse in synapses
-            ]
-
-            # If "Show Full Graph" is selected, show the full network
-            if selected_output_node == "":
-                filtered_nodes, filtered_synapses = nodes, cleaned_synapses
-            else:
-                selected_output_node = int(selected_output_node)
-
-                # Create a directed graph from synapses
-                G = nx.DiGraph()
-                for synapse in cleaned_synapses:
-                    G.add_edge(synapse["NodeIn"], synapse["NodeOut"], weight=synapse["Weight"])
-
-                # Find all nodes leading to the selected output node
-                reachable_nodes = set()
-
-                def trace_backwards(node):
-                    """ Recursively find all nodes leading to the selected output node. """
-                    if node in reachable_nodes:
-                        return
-                    reachable_nodes.add(node)
-                    for src, dest in G.edges:
-                        if dest == node:
-                            trace_backwards(src)
+            # Load the species template, shared with the gene charts and the output node dropdown
+            template = load_species_template(species_file, selected_species)
 
-                trace_backwards(selected_output_node)
+            if template is None:
+                return html.Div("No data available."), {"display": "none"}, _EMPTY_FIG, {"display": "none"}
 
-                # Ensure standalone output nodes are included
-                reachable_nodes.add(selected_output_node)
+            if len(template.get("nodes", [])) == 0:
+                return html.Div("No network data available."), {"display": "none"}, _EMPTY_FIG, {"display": "none"}
 
-                # Filter nodes and synapses
-                filtered_nodes = [n for n in nodes if n["Index"] in reachable_nodes]
-                filtered_synapses = [s for s in cleaned_synapses if s["NodeIn"] in reachable_nodes and s["NodeOut"] in reachable_nodes]
+            # The figure is built once per species, output node and version of the species file
+            network_graph = get_network_graph(species_file, selected_species, selected_output_node)
 
-            # Generate the neural network graph
-            network_graph = create_neural_network_graph(filtered_nodes, filtered_synapses)
+            if not with_genes:
+                return no_update, no_update, network_graph, {"display": "block"}
 
-            # Generate the gene bar chart
-            gene_chart = get_gene_bar_chart(sim_selected, selected_species, simulations_base_folder)
+            # Generate the gene charts from the template already loaded above
+            gene_chart = render_gene_chart(template.get("genes", {}), species_file, selected_species)
 
             return gene_chart, {"display": "block"}, network_graph, {"display": "block"}
 
-        except Exception as e:
-            print(f"Error processing species data: {e}")
-            return html.Div("Error loading data."), {"display": "none"}, go.Figure(), {"display": "none"}
+        except Exception:
+            logger.exception("Error processing species data")
+            return html.Div("Error loading data."), {"display": "none"}, _EMPTY_FIG, {"display": "none"}
 
 
         
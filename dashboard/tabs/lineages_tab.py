@@ -2,10 +2,78 @@
 import dash_bootstrap_components as dbc
 import pandas as pd
 import os
-import json
+import logging
 import plotly.express as px
 import dash_bootstrap_components as dbc
-from utils import seconds_to_hours, load_species_data, get_simulations_base_folder  # Import helper function
+from dashboard.utils import seconds_to_hours_array, load_species_data, load_species_template, get_simulations_base_folder, read_parquet, COUNTS_COLUMNS  # Import helper function
+
+logger = logging.getLogger(__name__)
+
+# Colors of the genes in the gene evolution graphs (same as bibites_tab.py); other genes use plotly's defaults
+GENE_EVOLUTION_COLORS = {
+    "ArmorWAG": "#555555",   # Dark Grey
+    "FatWAG": "#FFD700",     # Gold
+    "MouthMusclesWAG": "#FF8C00",  # Deep Orange
+    "MoveMusclesWAG": "#FFA07A",   # Muted Salmon
+    "StomachWAG": "#228B22", # Forest Green
+    "ThroatWAG": "#DC143C",  # Crimson
+    "WombWAG": "#FF69B4",    # Hot Pink
+    "ColorR": "Red",
+    "ColorG": "Green",
+    "ColorB": "Blue",
+}
+
+# Gene evolution graphs in display order, with the genes each one plots; the first half
+# goes in the left column and the rest in the right one
+GENE_EVOLUTION_GROUPS = [
+    ("Color Evolution", ["ColorR", "ColorG", "ColorB"]),
+    ("Incubation Time Evolution", ["LayTime", "HatchTime", "BroodTime"]),
+    ("WAG Evolution", ["ArmorWAG", "FatWAG", "MouthMusclesWAG", "MoveMusclesWAG", "StomachWAG", "ThroatWAG", "WombWAG"]),
+    ("Fat Conversion Evolution", ["FatStorageDeadband", "FatStorageThreshold"]),
+    ("Herd Weights Evolution", ["HerdSeparationWeight", "HerdVelocityWeight", "HerdAlignmentWeight", "HerdCohesionWeight"]),
+    ("Vision Evolution", ["ViewAngle", "ViewRadius"]),
+    ("Mutation Count Evolution", ["AverageMutationNumber", "BrainAverageMutation"]),
+    ("Mutation Sigma Evolution", ["MutationAmountSigma", "BrainMutationSigma"]),
+    ("Diet Evolution", ["Diet"]),
+    ("Size Evolution", ["SizeRatio"]),
+    ("Speed Evolution", ["SpeedRatio"]),
+    ("PheroSense Evolution", ["PheroSense"]),
+]
+
+def create_gene_evolution_graph(groups, gene_data, lineage_species_ids):
+    """
+    Plots how the genes of each group change along a lineage, as one figure with a row per group.
+
+    Parameters:
+    - groups (list of tuple): (title, gene names) of the graphs to include, in display order.
+    - gene_data (dict): Maps each gene name to its values, one per lineage species.
+    - lineage_species_ids (list): The lineage's species IDs, in the order of the gene values.
+
+    Returns:
+    - dcc.Graph or html.Div: The faceted figure, or a message if the lineage has too few species.
+    """
+    # Long format: one row per (species, graph, gene) value
+    long_df = pd.DataFrame(
+        [
+            (species_id, title, gene, value)
+            for title, genes in groups
+            for gene in genes
+            for species_id, value in zip(lineage_species_ids, gene_data.get(gene, []))
+        ],
+        columns=["SpeciesID", "group", "gene", "value"],
+    )
+    if long_df["SpeciesID"].nunique() < 2:
+        return html.Div("No valid gene data for this lineage.")
+
+    titles = [title for title, _ in groups if title in set(long_df["group"])]
+    fig = px.line(long_df, x="SpeciesID", y="value", color="gene", facet_row="group", markers=True,
+                  template="plotly_dark", color_discrete_map=GENE_EVOLUTION_COLORS,
+                  category_orders={"group": titles}, labels={"value": "", "gene": "Gene"},
+                  facet_row_spacing=0.04, height=350 * len(titles))
+    # Every graph keeps its own y scale, and is labeled with its title only
+    fig.update_yaxes(matches=None)
+    fig.for_each_annotation(lambda annotation: annotation.update(text=annotation.text.split("=", 1)[-1]))
+    return dcc.Graph(figure=fig)
 
 def get_lineages_tab_content(sim_selected, n_intervals, simulations_base_folder):
     """
@@ -138,20 +206,15 @@ def register_lineages_tab_callbacks(app):
             return "Population data missing.", html.Div(), html.Div(), html.Div()
 
         try:
-            counts_df = pd.read_parquet(counts_file)
-
-            if "speciesID" not in counts_df.columns or "update_time" not in counts_df.columns:
-                return "Invalid species counts data.", html.Div(), html.Div(), html.Div()
-
-            # Find lineage
+            # Find lineage, one dict lookup per ancestor instead of a scan of species_df
+            parent_ids = dict(zip(species_df["speciesID"].tolist(), species_df["parentID"].tolist()))
             lineage_species_ids = []
             current_species = selected_species
-            while current_species in species_df["speciesID"].values:
-                row = species_df[species_df["speciesID"] == current_species].iloc[0]
+            while current_species in parent_ids:
                 lineage_species_ids.append(current_species)
-                if pd.isna(row["parentID"]):
+                if pd.isna(parent_ids[current_species]):
                     break
-                current_species = row["parentID"]
+                current_species = parent_ids[current_species]
 
             # Handle root exclusion
             if "ignore" in (ignore_root_checkbox or []) and len(lineage_species_ids) > 1:
@@ -161,9 +224,19 @@ def register_lineages_tab_callbacks(app):
             lineage_text = " → ".join(map(lambda x: str(int(x)), reversed(lineage_species_ids)))
             lineage_display = html.Div([html.P(f"Lineage: {lineage_text}")])
 
-            # Lineage Population Graph
-            df_lineage = counts_df[counts_df["speciesID"].isin(lineage_species_ids)].copy()
-            df_lineage["hours"] = df_lineage["update_time"].apply(seconds_to_hours)
+            # Only the counts of the lineage's species are read from the counts file
+            counts_df = read_parquet(
+                counts_file,
+                columns=COUNTS_COLUMNS,
+                filters=[("speciesID", "in", [int(species_id) for species_id in lineage_species_ids])]
+            )
+
+            if "speciesID" not in counts_df.columns or "update_time" not in counts_df.columns:
+                return "Invalid species counts data.", html.Div(), html.Div(), html.Div()
+
+            # Lineage Population Graph; the read above already kept only the lineage's species
+            df_lineage = counts_df
+            df_lineage["hours"] = seconds_to_hours_array(df_lineage["update_time"])
 
             if not df_lineage.empty:
                 lineage_population_graph = dcc.Graph(
@@ -182,89 +255,30 @@ def register_lineages_tab_callbacks(app):
                 lineage_population_graph = html.Div("No lineage population data available.")
 
             # Extract gene data
+            # Only the templates of the lineage's species are read, each cached until the file changes
+            species_file = f"{simulations_base_folder}/{sim_selected}/species_data.parquet"
             gene_data = {}
             for species_id in lineage_species_ids:
-                species_row = species_df[species_df["speciesID"] == species_id]
-                if not species_row.empty and "template" in species_row.columns:
-                    template = species_row.iloc[0]["template"]
-                    if isinstance(template, str):
-                        try:
-                            template = json.loads(template)
-                        except json.JSONDecodeError:
-                            template = {}
-
-                    if isinstance(template, dict) and "genes" in template:
-                        for gene, value in template["genes"].items():
-                            if gene not in gene_data:
-                                gene_data[gene] = []
-                            gene_data[gene].append(value)
-
-            # Define WAG colors (same as bibites_tab.py)
-            wag_colors = {
-                "ArmorWAG": "#555555",   # Dark Grey
-                "FatWAG": "#FFD700",     # Gold
-                "MouthMusclesWAG": "#FF8C00",  # Deep Orange
-                "MoveMusclesWAG": "#FFA07A",   # Muted Salmon
-                "StomachWAG": "#228B22", # Forest Green
-                "ThroatWAG": "#DC143C",  # Crimson
-                "WombWAG": "#FF69B4",    # Hot Pink
-            }
-
-            color_gene_colors = {
-                "ColorR": "Red",
-                "ColorG": "Green",
-                "ColorB": "Blue"
-                }
-
-            # Gene Evolution Graphs
-            def create_graph(title, genes, color_map=None):
-                if not gene_data:
-                    return html.Div(f"No data available for {title}")
-
-                df = pd.DataFrame({gene: gene_data.get(gene, []) for gene in genes})
-                df.index = range(len(df))
-
-                if df.empty or df.shape[0] == 1:
-                    return html.Div(f"No valid data for {title}")
-
-                df["SpeciesID"] = lineage_species_ids[:len(df)]
-            
-                # Apply custom color mapping if provided
-                if color_map:
-                    fig = px.line(df, x="SpeciesID", y=df.columns[:-1], title=title, markers=True, template="plotly_dark",
-                                  color_discrete_map=color_map)
-                else:
-                    fig = px.line(df, x="SpeciesID", y=df.columns[:-1], title=title, markers=True, template="plotly_dark")
-
-                return dcc.Graph(figure=fig)
-
-            # Organized Gene Graphs
-            grouped_gene_graphs = [
-                create_graph("Color Evolution", ["ColorR", "ColorG", "ColorB"], color_gene_colors),
-                create_graph("Incubation Time Evolution", ["LayTime", "HatchTime", "BroodTime"]),
-                create_graph("WAG Evolution", ["ArmorWAG", "FatWAG", "MouthMusclesWAG", "MoveMusclesWAG", "StomachWAG", "ThroatWAG", "WombWAG"], wag_colors),
-                create_graph("Fat Conversion Evolution", ["FatStorageDeadband", "FatStorageThreshold"]),
-                create_graph("Herd Weights Evolution", ["HerdSeparationWeight", "HerdVelocityWeight", "HerdAlignmentWeight", "HerdCohesionWeight"]),
-                create_graph("Vision Evolution", ["ViewAngle", "ViewRadius"]),
-                create_graph("Mutation Count Evolution", ["AverageMutationNumber", "BrainAverageMutation"]),
-                create_graph("Mutation Sigma Evolution", ["MutationAmountSigma", "BrainMutationSigma"]),
-                create_graph("Diet Evolution", ["Diet"]),
-                create_graph("Size Evolution", ["SizeRatio"]),
-                create_graph("Speed Evolution", ["SpeedRatio"]),
-                create_graph("PheroSense Evolution", ["PheroSense"]),
-            ]
-
-            # Split into two columns
-            graphs_left = grouped_gene_graphs[:len(grouped_gene_graphs)//2]
-            graphs_right = grouped_gene_graphs[len(grouped_gene_graphs)//2:]
+                template = load_species_template(species_file, species_id)
+                if isinstance(template, dict) and "genes" in template:
+                    for gene, value in template["genes"].items():
+                        if gene not in gene_data:
+                            gene_data[gene] = []
+                        gene_data[gene].append(value)
+
+            # Each column of gene graphs is one faceted figure, so the plotly_dark template and
+            # layout are sent twice instead of once per gene group
+            half = len(GENE_EVOLUTION_GROUPS) // 2
+            graphs_left = create_gene_evolution_graph(GENE_EVOLUTION_GROUPS[:half], gene_data, lineage_species_ids)
+            graphs_right = create_gene_evolution_graph(GENE_EVOLUTION_GROUPS[half:], gene_data, lineage_species_ids)
 
             return (
                 lineage_display,
                 lineage_population_graph,
-                html.Div(graphs_left) if graphs_left else html.Div("No grouped genes available."),
-                html.Div(graphs_right) if graphs_right else html.Div("No non-combined genes available.")
+                graphs_left,
+                graphs_right
             )
 
-        except Exception as e:
-            print(f"Error updating lineage and graphs: {e}")
+        except Exception:
+            logger.exception("Error updating lineage and graphs")
             return "Error retrieving lineage data.", html.Div(), html.Div(), html.Div()
\ No newline at end of file
@@ -1,89 +1,69 @@
 import os
+import logging
+import functools
 import pandas as pd
 import plotly.express as px
 from dash import dcc, html, no_update
 import dash_bootstrap_components as dbc
-from utils import seconds_to_hours, load_species_data, get_simulations_base_folder
+from dashboard.utils import seconds_to_hours_array, get_simulations_base_folder, read_table, load_latest_counts, load_time_aggregates, COUNTS_COLUMNS
 
-def get_sim_tab_content(sim_selected, n_intervals, simulations_base_folder):
-    """
-    Generates the content for the Simulation tab
-
-    Parameters:
-    - sim_selected (str): The name of the selected simulation.
-    - n_intervals (int): Number of update intervals (not used directly).
-    - simulations_base_folder (str): Base folder containing simulation data.
+logger = logging.getLogger(__name__)
 
-    Returns:
-    - html.Div: A Dash HTML layout containing simulation charts.
+@functools.lru_cache(maxsize=16)
+def _build_sim_figures(counts_file, mtime_ns):
     """
-
-    # Ensure a simulation is selected
-    if not sim_selected:
-        return html.Div("Please select a simulation.")
-
-    # Load species metadata from the selected simulation
-    species_df, _ = load_species_data(sim_selected, simulations_base_folder)
-
-    # Load species counts data from the simulation's parquet file
-    counts_file = os.path.join(simulations_base_folder, sim_selected, "species_counts.parquet")
-
-    # Check if the species count file exists
-    if not os.path.exists(counts_file):
-        return html.Div("Simulation data missing.")
-
-    try:
-        # Read the species count data into a DataFrame
-        counts_df = pd.read_parquet(counts_file)
-    except Exception as e:
-        print(f"Error loading counts data: {e}")
-        return html.Div("Error loading simulation data.")
+    Build the Simulation tab figures as plain dicts.
+    Returns (bibites_chart, fig_alive, fig_total); bibites_chart is a message string
+    instead of a figure when there is no data or the chart could not be created.
+    """
+    # The per update_time aggregates come from the simulation's dashboard cache, and only the
+    # latest partition and the rows of the species alive in it are read from the counts
+    aggregates = load_time_aggregates(os.path.dirname(counts_file))
 
     # --- Bibites Alive Per Species Chart ---
     try:
-        if counts_df.empty:
-            bibites_chart = html.Div("No bibites data available.")
+        if aggregates.empty:
+            bibites_chart = "No bibites data available."
         else:
-            # Get the latest recorded update time
-            latest_update = counts_df["update_time"].max()
-            # Filter for the most recent data
-            latest_data = counts_df[counts_df["update_time"] == latest_update]
-            # Get species IDs that are still alive
-            species_alive_ids = latest_data[latest_data["count"] > 0]["speciesID"].unique()
-            # Filter the DataFrame to include only those species
-            df_line = counts_df[counts_df["speciesID"].isin(species_alive_ids)].sort_values("update_time")
+            # Get species IDs that are still alive at the most recent update
+            latest_counts = load_latest_counts(counts_file, columns=["speciesID", "count"])
+            species_alive_ids = latest_counts.loc[latest_counts["count"] > 0, "speciesID"].unique().tolist()
+            # Read only the rows of those species
+            if species_alive_ids:
+                df_line = (
+                    read_table(counts_file, columns=COUNTS_COLUMNS, filters=[("speciesID", "in", species_alive_ids)])
+                    .sort_by("update_time")
+                    .to_pandas()
+                )
+            else:
+                df_line = pd.DataFrame(columns=COUNTS_COLUMNS)
             # Convert time from seconds to hours for better readability
-            df_line["hours"] = df_line["update_time"].apply(seconds_to_hours)
+            df_line["hours"] = seconds_to_hours_array(df_line["update_time"])
 
             # Create a line chart displaying the population of each species over time
-            bibites_chart = dcc.Graph(
-                figure=px.line(
-                    df_line,
-                    x="hours",
-                    y="count",
-                    color="speciesID",
-                    title="Current Alive Per Species Over Simulated Time",
-                    markers=True,
-                    labels={"hours": "Hours", "count": "Bibites Alive", "speciesID": "Species ID"},
-                    template="plotly_dark"
-                )
-            )
-    except Exception as e:
-        print(f"Error creating bibites chart: {e}")
-        bibites_chart = html.Div("Error creating bibites chart.")
+            bibites_chart = px.line(
+                df_line,
+                x="hours",
+                y="count",
+                color="speciesID",
+                title="Current Alive Per Species Over Simulated Time",
+                markers=True,
+                labels={"hours": "Hours", "count": "Bibites Alive", "speciesID": "Species ID"},
+                template="plotly_dark"
+            ).to_dict()
+    except Exception:
+        logger.exception("Error creating bibites chart")
+        bibites_chart = "Error creating bibites chart."
 
     # --- Unique Species Alive Chart ---
     try:
-        # Count the number of unique species alive at each update time
+        # Number of unique species alive at each update time with any alive
         df_alive = (
-            counts_df[counts_df["count"] > 0]
-            .groupby("update_time")["speciesID"]
-            .nunique()
-            .reset_index(name="alive_species")
-            .sort_values("update_time")
+            aggregates.dropna(subset=["alive_species"])
+            .astype({"alive_species": "int64"})[["update_time", "alive_species"]]
         )
         # Convert update time to hours
-        df_alive["hours"] = df_alive["update_time"].apply(seconds_to_hours)
+        df_alive["hours"] = seconds_to_hours_array(df_alive["update_time"])
 
         # Create a line chart showing the number of unique species alive over time
         fig_alive = px.line(
@@ -94,22 +74,17 @@ def get_sim_tab_content(sim_selected, n_intervals, simulations_base_folder):
             markers=True,
             labels={"hours": "Hours", "alive_species": "Alive Species"},
             template="plotly_dark"
-        )
-    except Exception as e:
-        print(f"Error creating alive species chart: {e}")
+        ).to_dict()
+    except Exception:
+        logger.exception("Error creating alive species chart")
         fig_alive = {}
 
     # --- Total Bibites Chart ---
     try:
-        # Sum the total number of bibites alive at each update time
-        df_total = (
-            counts_df.groupby("update_time")["count"]
-            .sum()
-            .reset_index(name="total_bibites")
-            .sort_values("update_time")
-        )
+        # Total number of bibites alive at each update time
+        df_total = aggregates[["update_time", "total_bibites"]].copy()
         # Convert update time to hours
-        df_total["hours"] = df_total["update_time"].apply(seconds_to_hours)
+        df_total["hours"] = seconds_to_hours_array(df_total["update_time"])
 
         # Create a line chart showing the total bibites alive over time
         fig_total = px.line(
@@ -120,11 +95,56 @@ def get_sim_tab_content(sim_selected, n_intervals, simulations_base_folder):
             markers=True,
             labels={"hours": "Hours", "total_bibites": "Total Bibites Alive"},
             template="plotly_dark"
-        )
-    except Exception as e:
-        print(f"Error creating total bibites chart: {e}")
+        ).to_dict()
+    except Exception:
+        logger.exception("Error creating total bibites chart")
         fig_total = {}
 
+    return bibites_chart, fig_alive, fig_total
+
+def get_sim_figures(counts_file):
+    """
+    Return the Simulation tab figures for the counts file, rebuilding them only
+    when the file monitor has written new counts since the last call.
+    """
+    return _build_sim_figures(counts_file, os.stat(counts_file).st_mtime_ns)
+
+def get_sim_tab_content(sim_selected, n_intervals, simulations_base_folder):
+    """
+    Generates the content for the Simulation tab
+
+    Parameters:
+    - sim_selected (str): The name of the selected simulation.
+    - n_intervals (int): Number of update intervals (not used directly).
+    - simulations_base_folder (str): Base folder containing simulation data.
+
+    Returns:
+    - html.Div: A Dash HTML layout containing simulation charts.
+    """
+
+    # Ensure a simulation is selected
+    if not sim_selected:
+        return html.Div("Please select a simulation.")
+
+    # Load species counts data from the simulation's parquet file
+    counts_file = os.path.join(simulations_base_folder, sim_selected, "species_counts.parquet")
+
+    # Check if the species count file exists
+    if not os.path.exists(counts_file):
+        return html.Div("Simulation data missing.")
+
+    try:
+        # Figures are built once per version of the counts data and shared by every client
+        bibites_chart, fig_alive, fig_total = get_sim_figures(counts_file)
+    except Exception:
+        logger.exception("Error loading counts data")
+        return html.Div("Error loading simulation data.")
+
+    if isinstance(bibites_chart, str):
+        bibites_chart = html.Div(bibites_chart)
+    else:
+        bibites_chart = dcc.Graph(figure=bibites_chart)
+
     # Arrange the charts in two columns
     charts = dbc.Row([
         dbc.Col(dcc.Graph(figure=fig_alive), width=6),
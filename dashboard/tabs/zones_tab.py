@@ -5,103 +5,84 @@ import os
 import json
 import plotly.express as px
 import dash_bootstrap_components as dbc
-from utils import seconds_to_hours, load_pellet_data, get_simulations_base_folder, load_pellet_data
+from dashboard.utils import seconds_to_hours, load_pellet_data, get_simulations_base_folder, load_pellet_data
 
+# Styles of the tab's layout, shared by every render; Dash never modifies them
+_CENTER_WHITE_STYLE = {"textAlign": "center", "color": "white"}
+_COLUMN_STYLE = {
+    "flex": "1", 
+    "display": "flex", 
+    "flexDirection": "column", 
+    "gap": "20px",
+    'justifyContent': 'center',
+}
 
-def get_zone_list(pellet_df):
-    zone_names = []
-    zones = []
-    for zone in pellet_df['zone_name']:
-        if zone not in zone_names:
-            zone_names.append(zone)
-    return zone_names
 
-
-
-def build_zone_section(zone_names, pellet_df):
+def build_zone_data(pellet_df):
     """
-    Builds Zone info pannels
+    Builds the latest pellet stats of every zone, one dict per zone.
+    The zone panels are rendered from them in the browser by render_zones.
     """
+    if pellet_df.empty:
+        return []
 
-    
-    zones_html = []
-    for zone in zone_names:
-        latest_index = pellet_df[pellet_df['zone_name'] == zone]['update_time'].idxmax()
-        current_plant_count = pellet_df.loc[latest_index, 'plant_total_amount']
+    # The latest row of every zone is found in one grouped pass, with the zones in the order they first appear
+    latest = pellet_df.loc[pellet_df.groupby('zone_name', sort=False)['update_time'].idxmax()]
 
-        zones_html.append(
-                html.Div([
-                        html.H4(f"Zone: {zone}", style={"textAlign": "center", "color": "white"}),
-                        html.Div(
-                            style={
-                                "flex": "1", 
-                                "display": "flex", 
-                                "flexDirection": "row", 
-                                "gap": "20px",
-                                "padding": "20px",
-                                'justifyContent': 'center',
-                                'borderBottom': '4px solid #106881',
-                            },
-                            children = [
-                                html.Div(
-                                    style={
-                                        "flex": "1", 
-                                        "display": "flex", 
-                                        "flexDirection": "column", 
-                                        "gap": "20px",
-                                        'justifyContent': 'center',
-                                    },
-                                    children = [
-                                        html.H6(f"Latest Plant Count: {pellet_df.loc[latest_index, 'plant_pellet_count']}", style={"textAlign": "center", "color": "white"}),
-                                        html.H6(f"Latest Plant Amount: {round(pellet_df.loc[latest_index, 'plant_total_amount'], 2)}", style={"textAlign": "center", "color": "white"}),
-                                        html.H6(f"Latest Plant avg Amount: {round(pellet_df.loc[latest_index, 'plant_pellet_count']/pellet_df.loc[latest_index, 'plant_total_amount'], 2) if pellet_df.loc[latest_index, 'plant_total_amount'] > 0 else 0}", style={"textAlign": "center", "color": "white"}),
-                                        html.H6(f"Latest Plant avg Scale: {round(pellet_df.loc[latest_index, 'plant_avg_scale'], 2)}", style={"textAlign": "center", "color": "white"}),
-                                    ]
-                                ),
-                                html.Div(
-                                    style={
-                                        "flex": "1", 
-                                        "display": "flex", 
-                                        "flexDirection": "column", 
-                                        "gap": "20px",
-                                        'justifyContent': 'center',
-                                    },
-                                    children = [
-                                        html.H6(f"Latest Meat Count: {pellet_df.loc[latest_index, 'meat_pellet_count']}", style={"textAlign": "center", "color": "white"}),
-                                        html.H6(f"Latest Meat Amount: {round(pellet_df.loc[latest_index, 'meat_total_amount'], 2)}", style={"textAlign": "center", "color": "white"}),
-                                        html.H6(f"Latest Meat avg Amount: {round(pellet_df.loc[latest_index, 'meat_pellet_count']/pellet_df.loc[latest_index, 'meat_total_amount'], 2) if pellet_df.loc[latest_index, 'meat_total_amount'] > 0 else 0}", style={"textAlign": "center", "color": "white"}),
-                                        html.H6(f"Latest Meat avg Scale: {round(pellet_df.loc[latest_index, 'meat_avg_scale'], 2)}", style={"textAlign": "center", "color": "white"}),
-                                    ]
-                                ),
-                            ]
-                        )
-                    ])
-            )
-    return zones_html
+    # The derived and rounded stats are computed for all zones at once
+    zones_df = latest[['zone_name']].copy()
+    for material in ("plant", "meat"):
+        count = latest[f"{material}_pellet_count"]
+        total_amount = latest[f"{material}_total_amount"]
+        zones_df[f"{material}_pellet_count"] = count.astype("int64")
+        zones_df[f"{material}_total_amount"] = total_amount.round(2)
+        zones_df[f"{material}_avg_amount"] = (count / total_amount.where(total_amount > 0)).fillna(0).round(2)
+        zones_df[f"{material}_avg_scale"] = latest[f"{material}_avg_scale"].round(2)
+    return zones_df.to_dict("records")
+
+
+# Builds the zone panels from the zones-data store in the browser, so the server only sends the numbers
+render_zones = """
+function(zones) {
+    if (!zones) {
+        return [];
+    }
+    const h = (type, className, children) => ({
+        namespace: "dash_html_components", type: type, props: {className: className, children: children}
+    });
+    // One table per material, with a label and a value cell per stat; the styles are in assets/custom.css
+    const stats = (zone, material, prefix) => h("Table", "zone-stats", h("Tbody", undefined, [
+        ["Count", zone[prefix + "_pellet_count"]],
+        ["Amount", zone[prefix + "_total_amount"]],
+        ["avg Amount", zone[prefix + "_avg_amount"]],
+        ["avg Scale", zone[prefix + "_avg_scale"]],
+    ].map(([label, value]) => h("Tr", undefined, [h("Td", undefined, `Latest ${material} ${label}:`), h("Td", undefined, value)]))));
+    return zones.map(zone => h("Div", "zone-panel", [
+        h("H4", "zone-title", `Zone: ${zone.zone_name}`),
+        h("Div", "zone-stats-row", [stats(zone, "Plant", "plant"), stats(zone, "Meat", "meat")]),
+    ]));
+}
+"""
 
 
 def get_zones_tab_content(sim_selected, n_intervals, simulations_base_folder):
     pellet_df = load_pellet_data(sim_selected, simulations_base_folder)
-    zone_names = get_zone_list(pellet_df)
     
     return html.Div(
         
-        style={
-            "flex": "1", 
-            "display": "flex", 
-            "flexDirection": "column", 
-            "gap": "20px",
-            'justifyContent': 'center',
-        },
+        style=_COLUMN_STYLE,
         children = [
-            html.H3("Zone Data being added soon", style={"textAlign": "center", "color": "white"}),
-            html.Div(
-                children = build_zone_section(zone_names, pellet_df)
-            ),
+            html.H3("Zone Data being added soon", style=_CENTER_WHITE_STYLE),
+            dcc.Store(id="zones-data", data=build_zone_data(pellet_df)),
+            html.Div(id="zones-container"),
         ],
     )
 
 
 
 def register_zones_tab_callbacks(app):
-    pass
\ No newline at end of file
+    app.clientside_callback(
+        render_zones,
+        Output("zones-container", "children"),
+        Input("zones-data", "data")
+    )
@@ -1,6 +1,36 @@
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+import functools
 import json
+import logging
 import os
+import shutil
+import tempfile
+import orjson
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+# Threads for reading a simulation's parquet files concurrently
+_read_pool = ThreadPoolExecutor(max_workers=4)
+
+# species_counts.parquet is a dataset directory with one update_time=<simulated time> partition per save
+UPDATE_TIME_PARTITIONING = ds.partitioning(pa.schema([("update_time", pa.float64())]), flavor="hive")
+COUNTS_COLUMNS = ["update_time", "speciesID", "count"]
+# Columns of species_data.parquet behind the species lists; the large template column is read per species
+SPECIES_COLUMNS = ["speciesID", "parentID", "genericName", "specificName"]
+# Columns of pellet_data.parquet shown on the zones tab
+PELLET_COLUMNS = ["update_time", "zone_name",
+                  "plant_pellet_count", "plant_total_amount", "plant_avg_scale",
+                  "meat_pellet_count", "meat_total_amount", "meat_avg_scale"]
+# update_time only lives in the partition folder names, so only the narrow int32 columns are stored
+COUNTS_SCHEMA = pa.schema([("update_time", pa.float64()), ("speciesID", pa.int32()), ("count", pa.int32())])
+# Per update_time aggregates of the counts, kept beside them by load_time_aggregates
+DASHBOARD_CACHE_FILE = "dashboard_cache.parquet"
 
 
 def seconds_to_hours(seconds):
@@ -14,17 +44,26 @@ def seconds_to_hours(seconds):
         print(f"Error converting seconds to hours: {e}")
         return None
 
+def seconds_to_hours_array(seconds):
+    """
+    Convert a column of durations in seconds to hours, rounded to two decimal places,
+    in one NumPy operation instead of calling seconds_to_hours per value.
+    """
+    return np.round(np.asarray(seconds, dtype=np.float64) / 3600, 2)
+
+@functools.lru_cache(maxsize=1)
 def get_config():
     """
     Load and return the configuration from config.json,
     which is located in the parent folder of the dashboard folder.
+    The file is parsed once per process; the returned dict is shared and must not be modified.
     """
     # Get the directory containing this file (i.e. dashboard folder)
     base_dir = os.path.dirname(os.path.abspath(__file__))
     # config.json is assumed to be one level above the dashboard folder
     config_path = os.path.join(base_dir, "..", "config.json")
-    with open(config_path, "r") as f:
-        config = json.load(f)
+    with open(config_path, "rb") as f:
+        config = parse_json(f.read())
     return config
 
 
@@ -38,11 +77,13 @@ def get_base_folder():
         raise ValueError("Path_To_Autosave_Folder not found in config.json")
     return folder_path
 
+@functools.lru_cache(maxsize=1)
 def get_simulations_base_folder():
     """
     Return the simulation base folder.
     It is assumed that simulation data is stored in a folder named
     'Dibite_Simulation_Data' within the autosave folder.
+    Like the config it comes from, it is computed once per process.
     """
     base_folder = get_base_folder()
     return os.path.join(base_folder, "Dibite_Simulation_Data")
@@ -50,35 +91,388 @@ def get_simulations_base_folder():
 def load_processed_log(log_path):
     """Load processed ZIP filenames from a log file."""
     if os.path.exists(log_path):
+        # The log is read and split in one call rather than line by line
         with open(log_path, "r") as f:
-            return set(line.strip() for line in f if line.strip())
+            lines = f.read().splitlines()
+        return {name for name in map(str.strip, lines) if name}
     return set()
 
 def update_processed_log(log_path, processed_set):
     """Update the processed ZIP log file with new entries."""
     with open(log_path, "w") as f:
-        for filename in processed_set:
-            f.write(filename + "\n")
+        f.write("".join(filename + "\n" for filename in processed_set))
+
+def read_parquet(path, columns=None, filters=None):
+    """
+    Load a Parquet file, or a dataset directory partitioned by update_time
+    (such as species_counts.parquet), into a Pandas DataFrame.
+    Only the requested columns are decoded, and filters are pushed down to pyarrow
+    so row groups and partitions that cannot match are skipped. Files are memory-mapped
+    instead of being copied into read buffers.
+    """
+    return pd.read_parquet(path, columns=columns, filters=filters, partitioning=UPDATE_TIME_PARTITIONING,
+                           memory_map=True)
+
+def read_table(path, columns=None, filters=None):
+    """
+    Load a Parquet file or update_time-partitioned dataset like read_parquet, but return
+    the pyarrow Table, for callers that aggregate with pyarrow.compute before converting.
+    """
+    return pq.read_table(path, columns=columns, filters=filters, partitioning=UPDATE_TIME_PARTITIONING,
+                         memory_map=True)
 
 def load_dataframe(file_path, columns=None):
-    """Load a Parquet file into a Pandas DataFrame, returning an empty DataFrame if not found."""
+    """
+    Load a Parquet file into a Pandas DataFrame, returning an empty DataFrame if not found.
+    If columns is given, only those columns are read.
+    """
     if os.path.exists(file_path):
         try:
-            return pd.read_parquet(file_path)
+            return read_parquet(file_path, columns=columns)
         except Exception as e:
             print(f"Error loading {file_path}: {e}")
     return pd.DataFrame(columns=columns) if columns else pd.DataFrame()
 
+@functools.lru_cache(maxsize=32)
+def _read_parquet_cached(path, mtime_ns, size, columns):
+    return read_parquet(path, columns=list(columns) if columns else None)
+
+def read_parquet_cached(path, columns=None):
+    """
+    Load a Parquet file, reusing the last DataFrame read while the file is unchanged.
+    The cache is keyed on the file's mtime and size, so a rewrite by the file monitor
+    is picked up on the next call. The returned DataFrame is shared between callers
+    and must not be modified in place.
+    """
+    stat = os.stat(path)
+    return _read_parquet_cached(path, stat.st_mtime_ns, stat.st_size, tuple(columns) if columns else None)
+
+def parse_json(data):
+    """Parse JSON from a str or bytes with orjson, which is several times faster than the json module."""
+    try:
+        return orjson.loads(data)
+    except orjson.JSONDecodeError:
+        # orjson rejects NaN/Infinity literals that the stdlib parser accepts
+        return json.loads(data)
+
+@functools.lru_cache(maxsize=128)
+def _load_species_template(species_file, species_id, mtime_ns, size):
+    table = pq.read_table(species_file, columns=["template"], filters=[("speciesID", "==", species_id)],
+                          memory_map=True)
+    if table.num_rows == 0:
+        return None
+    template = table.column("template")[0].as_py()
+    if isinstance(template, str):
+        template = parse_json(template)
+    return template
+
+def load_species_template(species_file, species_id):
+    """
+    Return the template (genes, nodes and synapses) of one species as plain Python
+    dicts and lists, or None if the species is not in species_file.
+    Only the template of that species is decoded, and it is cached until the file
+    changes. The returned dict is shared between callers and must not be modified.
+    """
+    if not os.path.exists(species_file):
+        return None
+    stat = os.stat(species_file)
+    return _load_species_template(species_file, int(species_id), stat.st_mtime_ns, stat.st_size)
+
+@functools.lru_cache(maxsize=32)
+def _count_rows(path, mtime_ns, size):
+    return pq.ParquetFile(path).metadata.num_rows
+
+def count_rows(path):
+    """
+    Return the number of rows in a Parquet file from its footer metadata,
+    without reading any column. Cached until the file changes.
+    """
+    stat = os.stat(path)
+    return _count_rows(path, stat.st_mtime_ns, stat.st_size)
+
+@functools.lru_cache(maxsize=4)
+def _list_simulations(base_folder, mtime_ns):
+    # scandir knows each entry's type from the directory listing, so no extra stat per entry
+    with os.scandir(base_folder) as entries:
+        return [entry.name for entry in entries if entry.is_dir()]
+
+def list_simulations(base_folder):
+    """
+    Return the simulation folder names in base_folder.
+    The listing is cached until the folder's mtime changes, which happens when
+    the file monitor creates the folder of a new simulation.
+    """
+    return _list_simulations(base_folder, os.stat(base_folder).st_mtime_ns)
+
+def get_data_fingerprint(sim_folder):
+    """
+    Return the mtimes of the simulation's data files (None for a missing file).
+    The fingerprint changes whenever the file monitor writes new data.
+    The nanosecond mtimes are kept as strings: they exceed 2**53, so as numbers they
+    would come back from the browser's dcc.Store rounded and never compare equal.
+    """
+    fingerprint = []
+    for file_name in ("species_data.parquet", "species_counts.parquet", "pellet_data.parquet"):
+        try:
+            fingerprint.append(str(os.stat(os.path.join(sim_folder, file_name)).st_mtime_ns))
+        except OSError:
+            fingerprint.append(None)
+    return tuple(fingerprint)
+
 def save_dataframe(df, file_path):
     """Save a Pandas DataFrame to a Parquet file."""
     try:
         # Ensure the directory exists
         os.makedirs(os.path.dirname(file_path), exist_ok=True)
 
-        df.to_parquet(file_path, index=False)
+        # The files are written once per batch and read on every dashboard refresh;
+        # zstd level 1 keeps them small while staying fast to write and decode
+        df.to_parquet(file_path, engine="pyarrow", index=False, compression="zstd", compression_level=1,
+                      row_group_size=64_000)
     except Exception as e:
         print(f"Error saving data to {file_path}: {e}")
 
+def max_update_time(counts_file):
+    """
+    Return the largest update_time in a single-file counts parquet, or None if it is empty.
+    The row group statistics in the footer are used, so the column is only decoded
+    when a row group has no statistics.
+    """
+    metadata = pq.ParquetFile(counts_file).metadata
+    column = metadata.schema.names.index("update_time")
+    maxima = []
+    for i in range(metadata.num_row_groups):
+        statistics = metadata.row_group(i).column(column).statistics
+        if statistics is None or not statistics.has_min_max:
+            times = read_parquet(counts_file, columns=["update_time"])["update_time"]
+            return None if times.empty else times.max()
+        maxima.append(statistics.max)
+    return max(maxima) if maxima else None
+
+def latest_partition(counts_dir):
+    """
+    Return the folder name and update_time of the latest partition of the counts
+    dataset, or (None, None) if it has no partitions.
+    """
+    partitions = [entry.name for entry in os.scandir(counts_dir)
+                  if entry.is_dir() and entry.name.startswith("update_time=")]
+    if not partitions:
+        return None, None
+    latest = max(partitions, key=lambda name: float(name.split("=", 1)[1]))
+    return latest, float(latest.split("=", 1)[1])
+
+def load_latest_counts(counts_path, columns=COUNTS_COLUMNS):
+    """
+    Load only the species counts recorded at the latest update_time.
+    For the partitioned dataset the latest partition is found from the folder names,
+    so only that partition is read. For a legacy single file the maximum comes from
+    the row group statistics, and the rows at that time are read with a filter.
+    Only the given columns are decoded.
+    """
+    if not os.path.isdir(counts_path):
+        latest_update = max_update_time(counts_path)
+        if latest_update is None:
+            return pd.DataFrame(columns=columns)
+        return read_parquet(counts_path, columns=columns, filters=[("update_time", "==", latest_update)])
+
+    latest, latest_update = latest_partition(counts_path)
+    if latest is None:
+        return pd.DataFrame(columns=columns)
+    # update_time is not stored in the partition's files, only in its folder name
+    latest_df = pd.read_parquet(os.path.join(counts_path, latest),
+                                columns=[column for column in columns if column != "update_time"], memory_map=True)
+    if "update_time" in columns:
+        latest_df["update_time"] = latest_update
+    return latest_df[columns]
+
+@functools.lru_cache(maxsize=32)
+def _count_alive_species(counts_path, mtime_ns):
+    # The count column is read into Arrow and counted with Arrow's compute kernels, never converted to pandas
+    if os.path.isdir(counts_path):
+        latest, _ = latest_partition(counts_path)
+        if latest is None:
+            return 0
+        table = pq.read_table(os.path.join(counts_path, latest), columns=["count"], memory_map=True)
+    else:
+        latest_update = max_update_time(counts_path)
+        if latest_update is None:
+            return 0
+        table = pq.read_table(counts_path, columns=["count"], filters=[("update_time", "==", latest_update)],
+                              memory_map=True)
+    return pc.sum(pc.greater(table["count"], 0)).as_py() or 0
+
+def count_alive_species(counts_path):
+    """
+    Return the number of species alive at the latest update_time.
+    The count is cached until the file monitor writes new counts.
+    """
+    return _count_alive_species(counts_path, os.stat(counts_path).st_mtime_ns)
+
+def _write_counts_dataset(counts_df, counts_path):
+    ds.write_dataset(
+        pa.Table.from_pandas(counts_df[COUNTS_COLUMNS], preserve_index=False).cast(COUNTS_SCHEMA),
+        counts_path,
+        format="parquet",
+        file_options=ds.ParquetFileFormat().make_write_options(compression="zstd"),
+        partitioning=UPDATE_TIME_PARTITIONING,
+        existing_data_behavior="overwrite_or_ignore",
+    )
+
+def _timed_counts(counts_df, counts_path):
+    """Return the counts with a numeric update_time, and whether any rows had to be left out."""
+    counts_df = counts_df.assign(update_time=pd.to_numeric(counts_df["update_time"], errors="coerce"))
+    untimed = counts_df["update_time"].isna().any()
+    if untimed:
+        print(f"Skipping counts without a simulated time for {counts_path}")
+        counts_df = counts_df.dropna(subset=["update_time"])
+    return counts_df, untimed
+
+def save_counts(counts_df, counts_path):
+    """
+    Append species counts to the dataset partitioned by update_time.
+    Only the partitions of the given update times are written; the rest of the
+    history is left untouched. A legacy single-file species_counts.parquet is
+    merged into the new dataset directory.
+    """
+    try:
+        os.makedirs(os.path.dirname(counts_path), exist_ok=True)
+        if os.path.isfile(counts_path):
+            _migrate_legacy_counts(counts_df, counts_path)
+            return
+
+        counts_df, _ = _timed_counts(counts_df, counts_path)
+        _write_counts_dataset(counts_df, counts_path)
+    except Exception as e:
+        print(f"Error saving data to {counts_path}: {e}")
+
+def _migrate_legacy_counts(counts_df, counts_path):
+    """
+    Replace a legacy single-file species_counts.parquet by the partitioned dataset,
+    holding its rows and the new counts. The dataset is written to a temporary sibling
+    directory and only swapped in once complete, so the legacy file is kept whenever
+    writing fails. Legacy rows without a numeric simulated time cannot be partitioned;
+    if there are any, the legacy file is kept as species_counts.legacy.parquet.
+    """
+    legacy_df, legacy_untimed = _timed_counts(read_parquet(counts_path), counts_path)
+    counts_df, _ = _timed_counts(counts_df, counts_path)
+
+    parent = os.path.dirname(counts_path)
+    tmp_dir = tempfile.mkdtemp(dir=parent, suffix=".tmp")
+    backup_path = os.path.join(parent, "species_counts.legacy.parquet")
+    try:
+        _write_counts_dataset(pd.concat([legacy_df, counts_df], ignore_index=True), tmp_dir)
+        # A directory cannot replace a file, so the legacy file is moved aside first and put back on failure
+        os.replace(counts_path, backup_path)
+        try:
+            os.replace(tmp_dir, counts_path)
+        except Exception:
+            os.replace(backup_path, counts_path)
+            raise
+    except Exception:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise
+
+    if legacy_untimed:
+        print(f"Kept the legacy counts with rows without a simulated time as {backup_path}")
+    else:
+        os.remove(backup_path)
+
+def _aggregate_counts_over_time(counts_file):
+    counts = read_table(counts_file, columns=COUNTS_COLUMNS)
+    alive = (counts.filter(pc.greater(counts["count"], 0))
+             .group_by("update_time").aggregate([("speciesID", "count_distinct")]))
+    total = counts.group_by("update_time").aggregate([("count", "sum")])
+    joined = total.join(alive, "update_time", join_type="left outer")
+    # Columns are picked by name; older pyarrow versions order the aggregate columns differently
+    return pa.table({
+        "update_time": joined["update_time"],
+        "alive_species": joined["speciesID_count_distinct"],
+        "total_bibites": joined["count_sum"],
+    }).sort_by("update_time")
+
+def load_time_aggregates(sim_folder):
+    """
+    Return a DataFrame with, for every update_time (sorted), the number of species with a
+    count above 0 (alive_species, null when there are none) and the number of bibites alive
+    (total_bibites).
+    The aggregates are kept in dashboard_cache.parquet beside the counts, tagged with the
+    mtime of the counts they were computed from. The full counts history is only aggregated
+    again once the file monitor has written new counts, even across dashboard restarts.
+    """
+    counts_file = os.path.join(sim_folder, "species_counts.parquet")
+    cache_file = os.path.join(sim_folder, DASHBOARD_CACHE_FILE)
+    counts_mtime = str(os.stat(counts_file).st_mtime_ns).encode()
+    try:
+        if (pq.read_schema(cache_file).metadata or {}).get(b"counts_mtime_ns") == counts_mtime:
+            return pq.read_table(cache_file, memory_map=True).to_pandas()
+    except FileNotFoundError:
+        pass
+    except Exception:
+        logger.exception("Error loading %s", cache_file)
+
+    table = _aggregate_counts_over_time(counts_file).replace_schema_metadata({b"counts_mtime_ns": counts_mtime})
+    # Every writer uses its own temporary file, so concurrent requests never replace
+    # the cache with a partial file and a reader never sees one
+    fd, tmp_file = tempfile.mkstemp(dir=sim_folder, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            pq.write_table(table, f, compression="zstd")
+        os.replace(tmp_file, cache_file)
+    except Exception:
+        logger.exception("Error saving data to %s", cache_file)
+        try:
+            os.remove(tmp_file)
+        except OSError:
+            pass
+    return table.to_pandas()
+
+@functools.lru_cache(maxsize=32)
+def _load_latest_snapshot(snapshot_file, mtime_ns):
+    with open(snapshot_file, "r") as f:
+        return json.load(f)
+
+def load_latest_snapshot(sim_folder):
+    """
+    Load the simulation's latest.json snapshot written by the file monitor,
+    or return None if it does not exist or cannot be read.
+    The file is only parsed again when its mtime changes; the returned dict is
+    shared and must not be modified.
+    """
+    snapshot_file = os.path.join(sim_folder, "latest.json")
+    try:
+        return _load_latest_snapshot(snapshot_file, os.stat(snapshot_file).st_mtime_ns)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        print(f"Error loading {snapshot_file}: {e}")
+        return None
+
+def update_latest_snapshot(sim_folder, total_species, new_counts):
+    """
+    Update latest.json with the number of species seen and, if new_counts holds a
+    later update_time than the snapshot, the number of species alive at that time.
+    The dashboard headers read this small file instead of the full history.
+    """
+    snapshot_file = os.path.join(sim_folder, "latest.json")
+    try:
+        snapshot = dict(load_latest_snapshot(sim_folder) or {})
+        snapshot["total_species"] = int(total_species)
+
+        update_times = pd.to_numeric(new_counts["update_time"], errors="coerce")
+        latest_update = update_times.max()
+        if pd.notna(latest_update) and latest_update > snapshot.get("update_time", float("-inf")):
+            latest = new_counts[update_times == latest_update]
+            snapshot["update_time"] = float(latest_update)
+            snapshot["alive_species"] = int(np.count_nonzero(latest["count"].to_numpy() > 0))
+
+        # Written to a temporary file first so the dashboard never reads a partial snapshot
+        os.makedirs(sim_folder, exist_ok=True)
+        with open(snapshot_file + ".tmp", "w") as f:
+            json.dump(snapshot, f)
+        os.replace(snapshot_file + ".tmp", snapshot_file)
+    except Exception as e:
+        print(f"Error saving data to {snapshot_file}: {e}")
+
 def get_update_frequency():
     """
     Return the update frequency (in seconds) from the configuration.
@@ -88,23 +482,71 @@ def get_update_frequency():
     return config.get("UpdateFrequency", 600)
 
 def load_pellet_data(sim_selected, simulations_base_folder):
+    """
+    Load the PELLET_COLUMNS of the selected simulation's pellet_data.parquet, returning an
+    empty DataFrame if it is missing or unreadable. The DataFrame is cached until the file
+    changes, so it is shared between interval ticks and must not be modified in place.
+    """
+    if not sim_selected:
+        return pd.DataFrame()
+
     sim_folder = os.path.join(simulations_base_folder, sim_selected)
     pellet_file = os.path.join(sim_folder, "pellet_data.parquet")
 
-    pellet_df = pd.read_parquet(pellet_file)
+    if not os.path.exists(pellet_file):
+        return pd.DataFrame()
+
+    try:
+        return read_parquet_cached(pellet_file, columns=PELLET_COLUMNS)
+    except Exception as e:
+        print(f"Error loading pellet data: {e}")
+        return pd.DataFrame()
+
+@functools.lru_cache(maxsize=8)
+def _load_species_data(species_file, counts_file, species_mtime_ns, counts_mtime_ns):
+    # Both files are read at the same time; pyarrow releases the GIL while reading
+    species_future = _read_pool.submit(read_parquet, species_file, columns=SPECIES_COLUMNS)
+    # Only the counts at the latest update time are needed
+    counts_future = _read_pool.submit(load_latest_counts, counts_file, columns=["speciesID", "count"])
+    species_df = species_future.result()
+    latest_counts = counts_future.result()
 
-    if pellet_df.empty:
+    if species_df.empty or latest_counts.empty:
         return pd.DataFrame(), []
-    else:
-        return pellet_df
+
+    # Merge to get alive counts per species; species missing from the latest update have 0
+    species_df = species_df.merge(latest_counts, on="speciesID", how="left")
+    species_df["count"] = species_df["count"].fillna(0).astype("int64")
+
+    # Sort species by the number of alive individuals (descending)
+    species_df = species_df.sort_values(by="count", ascending=False)
+
+    # Create list of dropdown options from the raw columns, without boxing every row in a Series
+    species_options = [
+        {
+            "label": f"{species_id}: {generic_name} {specific_name} (Alive: {count})",
+            "value": species_id,
+        }
+        for species_id, generic_name, specific_name, count in zip(
+            species_df["speciesID"].tolist(),
+            species_df["genericName"].tolist(),
+            species_df["specificName"].tolist(),
+            species_df["count"].tolist(),
+        )
+    ]
+
+    return species_df, species_options
 
 def load_species_data(sim_selected, simulations_base_folder):
     """
     Load and process species data for the selected simulation.
-    - Reads species_data.parquet and species_counts.parquet
+    - Reads the SPECIES_COLUMNS of species_data.parquet and species_counts.parquet;
+      templates are left out, load_species_template reads them per species
     - Determines alive species count from the latest update
     - Sorts species by alive count in descending order
     - Returns a tuple (species_df, sorted_species_list)
+    The result is cached until either file changes, so the tab, its dropdown callbacks
+    and every client share one read; it must not be modified in place.
     """
 
     if not sim_selected:
@@ -119,63 +561,31 @@ def load_species_data(sim_selected, simulations_base_folder):
         return pd.DataFrame(), []
 
     try:
-        # Load species data
-        species_df = pd.read_parquet(species_file)
-        counts_df = pd.read_parquet(counts_file)
-
-        if species_df.empty or counts_df.empty:
-            return pd.DataFrame(), []
-
-        # Get latest update time
-        latest_update = counts_df["update_time"].max()
-        latest_counts = counts_df[counts_df["update_time"] == latest_update]
-
-        # Merge to get alive counts per species
-        species_df = species_df.merge(
-            latest_counts[["speciesID", "count"]], on="speciesID", how="left"
-        ).fillna({"count": 0})  # Fill missing values with 0
-
-        # Sort species by the number of alive individuals (descending)
-        species_df = species_df.sort_values(by="count", ascending=False)
-
-        # Create list of dropdown options
-        species_options = [
-            {
-                "label": f"{row['speciesID']}: {row['genericName']} {row['specificName']} (Alive: {int(row['count'])})",
-                "value": row["speciesID"],
-            }
-            for _, row in species_df.iterrows()
-        ]
-
-        return species_df, species_options
-
+        # A new counts partition is a new entry in the dataset directory, which changes its mtime
+        return _load_species_data(species_file, counts_file,
+                                  os.stat(species_file).st_mtime_ns, os.stat(counts_file).st_mtime_ns)
     except Exception as e:
         print(f"Error loading species data: {e}")
         return pd.DataFrame(), []
 
 
+# Names of the neuron activation types, indexed by the template's node Type
+NODE_TYPES = (
+    "Input",
+    "Sigmoid",
+    "Linear",
+    "TanH",
+    "Sine",
+    "ReLu",
+    "Gaussian",
+    "Differential",
+    "Latch",
+    "Abs",
+    "Mult",
+    "Integrator",
+    "Inhibitory",
+    "SoftLatch",
+) + tuple(str(i) for i in range(14, 21))
+
 def getNodeType(type):
-    node_types = {
-        "0": "Input",
-        "1": "Sigmoid",
-        "2": "Linear",
-        "3": "TanH",
-        "4": "Sine",
-        "5": "ReLu",
-        "6": "Gaussian",
-        "7": "Differential",
-        "8": "Latch",
-        "9": "Abs",
-        "10":"Mult",
-        "11":"Integrator",
-        "12":"Inhibitory",
-        "13":"SoftLatch",
-        "14":"14",
-        "15":"15",
-        "16":"16",
-        "17":"17",
-        "18":"18",
-        "19":"19",
-        "20":"20",
-    }
-    return node_types[type]
+    return NODE_TYPES[int(type)]